@@ -0,0 +1,67 @@
+import argparse
+import ast
+import json
+import sys
+
+from src.BatchSolver import solve_many
+from src.Budget import Budget
+from src.SolutionCache import SolutionCache
+from src.Solvers import Solvers
+
+
+def read_states(f_name):
+    r"""
+    Reads states from file generated by `tests/unittest_generator.py`.
+
+    Every line that contains a state is a 2D list, all other lines (e.g. the
+    seed) are skipped.
+    """
+
+    states = []
+    with open(f_name) as f:
+        for line in f:
+            line = line.strip()
+            if line.startswith("["):
+                states.append(ast.literal_eval(line))
+
+    return states
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--input", type=str, required=True,
+                        help="File with starting states.")
+    parser.add_argument("--solver", type=str, required=True,
+                        choices=sorted(Solvers.TAGS), help="Solver tag.")
+    parser.add_argument("--heuristic", type=str, default=None,
+                        help="Heuristics used by solver.")
+    parser.add_argument("--workers", type=int, default=None,
+                        help="Number of processes.")
+    parser.add_argument("--max_expansions", type=int, default=None,
+                        help="Maximum number of expansions per puzzle.")
+    parser.add_argument("--time_limit", type=float, default=None,
+                        help="Time limit per puzzle in seconds.")
+    parser.add_argument("--max_closed", type=int, default=None,
+                        help="Maximum number of states in memory per puzzle.")
+    parser.add_argument("--cache", type=str, default=None,
+                        help="Database of cached solutions.")
+    parser.add_argument("--paths", action="store_true",
+                        help="Include solution paths in the output.")
+    args = parser.parse_args()
+
+    states = read_states(args.input)
+
+    kwargs = {}
+    if args.heuristic is not None:
+        kwargs["heuristic"] = args.heuristic
+    solver_spec = (Solvers.get_solver_idx(args.solver), kwargs)
+    budget = Budget(args.max_expansions, args.time_limit, args.max_closed)
+    cache = SolutionCache(path=args.cache) if args.cache else None
+
+    # one JSON object per line, printed as soon as puzzle is solved
+    for result in solve_many(states, solver_spec, workers=args.workers,
+                             budget=budget, cache=cache):
+        if not args.paths:
+            del result["path"]
+        print(json.dumps(result))
+        sys.stdout.flush()
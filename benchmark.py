@@ -0,0 +1,248 @@
+import argparse
+import json
+import multiprocessing
+import os
+import platform
+import queue
+import resource
+import subprocess
+import time
+
+import numpy as np
+
+from src.LookupSolver import LookupSolver
+from src.Solvers import Solvers
+from utils.utils import random_state, move_table
+
+KORF100_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                            "benchmarks", "korf100.txt")
+INSTANCE_SETS = ["korf100", "random3x3", "walk4x4"]
+
+
+def load_korf100(f_name=KORF100_PATH):
+    r"""
+    Loads Korf's 100 instances of 15-puzzle.
+
+    Returns:
+        instances (list): Pairs of starting states and optimal lengths.
+    """
+
+    instances = []
+    with open(f_name) as f:
+        for line in f:
+            if line.startswith("#"):
+                continue
+
+            values = [int(x) for x in line.split()]
+            tiles, length = values[1:17], values[17]
+            instances.append(([tiles[i:i + 4] for i in range(0, 16, 4)],
+                              length))
+
+    return instances
+
+
+def random_3x3(n_instances, seed):
+    r"""
+    Generates random solvable 3x3 instances.
+
+    Optimal lengths are taken from the complete lookup table.
+
+    Returns:
+        instances (list): Pairs of starting states and optimal lengths.
+    """
+
+    rng = np.random.RandomState(seed)
+    oracle = LookupSolver(3)
+
+    instances = []
+    for _ in range(n_instances):
+        state = random_state(3, rng=rng)
+        instances.append((state, oracle.distance(state)))
+
+    return instances
+
+
+def walk_4x4(n_instances, seed, walk_length):
+    r"""
+    Generates 4x4 instances by random walks from the final state.
+
+    Walks never undo the previous move. Optimal lengths aren't known.
+
+    Returns:
+        instances (list): Pairs of starting states and `None`.
+    """
+
+    rng = np.random.RandomState(seed)
+    moves = move_table(4)
+
+    instances = []
+    for _ in range(n_instances):
+        tiles, blank, prev = list(range(16)), 0, None
+        for _ in range(walk_length):
+            targets = [t for t, _ in moves[blank] if t != prev]
+            target = targets[rng.randint(len(targets))]
+            tiles[blank], tiles[target] = tiles[target], 0
+            blank, prev = target, blank
+
+        instances.append(([tiles[i:i + 4] for i in range(0, 16, 4)], None))
+
+    return instances
+
+
+def _run(results, solver_tag, kwargs, state):
+    r"""Solves single instance, executed in a separate process."""
+    solver = Solvers.get_solver_instance(Solvers.get_solver_idx(solver_tag))(
+        len(state), **kwargs)
+
+    start_time = time.time()
+    flag, (n_iters, path) = solver.solve(state)
+    elapsed = time.time() - start_time
+
+    # peak resident memory of this process, in kilobytes on Linux
+    peak_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+    results.put((flag, n_iters, path, elapsed, peak_rss))
+
+
+def run_instance(solver_tag, kwargs, state, timeout):
+    r"""
+    Runs solver on single instance in a fresh process.
+
+    Fresh process makes peak memory of each run independent of the others.
+    Process is terminated if it doesn't finish within `timeout` seconds.
+
+    Returns:
+        record (dict): Measurements of the run.
+    """
+
+    results = multiprocessing.Queue()
+    process = multiprocessing.Process(target=_run,
+                                      args=(results, solver_tag, kwargs,
+                                            state))
+    process.start()
+
+    try:
+        flag, n_iters, path, elapsed, peak_rss = results.get(timeout=timeout)
+    except queue.Empty:
+        process.terminate()
+        process.join()
+
+        return {"status": "timeout", "time": timeout}
+
+    process.join()
+
+    return {
+        "status": "solved" if flag else "unsolvable",
+        "expanded": n_iters,
+        "time": elapsed,
+        "nodes_per_sec": n_iters / elapsed if elapsed > 0 else None,
+        "peak_rss_kb": peak_rss,
+        "length": len(path) - 1 if path is not None else None,
+    }
+
+
+def git_commit():
+    r"""Returns hash of the current commit, `None` outside of git."""
+    try:
+        commit = subprocess.check_output(["git", "rev-parse", "HEAD"],
+                                         stderr=subprocess.DEVNULL)
+        return commit.decode().strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--set", type=str, required=True,
+                        choices=INSTANCE_SETS, help="Instance set.")
+    parser.add_argument("--solvers", type=str, nargs="+",
+                        default=sorted(Solvers.TAGS), choices=Solvers.TAGS,
+                        help="Solver tags, all solvers by default.")
+    parser.add_argument("--heuristic", type=str, default=None,
+                        help="Heuristics used by solvers.")
+    parser.add_argument("--weight", type=float, default=None,
+                        help="Weight (suboptimality bound) of WA* solvers.")
+    parser.add_argument("--mode", type=str, default=None,
+                        help="Weighting mode of WA* solvers.")
+    parser.add_argument("--n_instances", type=int, default=None,
+                        help="Number of instances (first ones for korf100).")
+    parser.add_argument("--walk_length", type=int, default=30,
+                        help="Length of random walks for walk4x4.")
+    parser.add_argument("--seed", type=int, default=42, help="Random seed.")
+    parser.add_argument("--timeout", type=float, default=60,
+                        help="Time limit per instance in seconds.")
+    parser.add_argument("--output", type=str, default=None,
+                        help="Output JSON file.")
+    args = parser.parse_args()
+
+    if args.set == "korf100":
+        instances = load_korf100()[:args.n_instances]
+    elif args.set == "random3x3":
+        instances = random_3x3(args.n_instances or 50, args.seed)
+    else:
+        instances = walk_4x4(args.n_instances or 20, args.seed,
+                             args.walk_length)
+
+    kwargs = {}
+    if args.heuristic is not None:
+        kwargs["heuristic"] = args.heuristic
+
+    # weighting is configurable only for weighted A* solvers
+    wastar_kwargs = dict(kwargs)
+    if args.weight is not None:
+        # integer weights keep f scores integer (bucket open list)
+        wastar_kwargs["weight"] = int(args.weight) \
+            if args.weight.is_integer() else args.weight
+    if args.mode is not None:
+        # records are labeled by solver tag, so mode can't replace more tags
+        if len([tag for tag in args.solvers
+                if tag.startswith("wastar")]) != 1:
+            parser.error("--mode requires exactly one wastar solver")
+        wastar_kwargs["mode"] = args.mode
+
+    records = []
+    for solver_tag in args.solvers:
+        solver_kwargs = kwargs
+        if solver_tag.startswith("wastar"):
+            solver_kwargs = wastar_kwargs
+
+        for idx, (state, optimal) in enumerate(instances):
+            record = run_instance(solver_tag, solver_kwargs, state,
+                                  args.timeout)
+            record.update({"solver": solver_tag, "instance": idx,
+                           "optimal": optimal})
+            if solver_tag.startswith("wastar"):
+                # mode actually used, which may differ from the tag
+                record["mode"] = solver_kwargs.get(
+                    "mode", solver_tag[len("wastar_"):])
+            records.append(record)
+
+            print(json.dumps(record))
+
+    # summary for each solver
+    for solver_tag in args.solvers:
+        solved = [r for r in records
+                  if r["solver"] == solver_tag and r["status"] == "solved"]
+        total_time = sum(r["time"] for r in solved)
+        total_nodes = sum(r["expanded"] for r in solved)
+        n_optimal = sum(1 for r in solved if r["length"] == r["optimal"])
+        # the worst ratio of path length and optimal length
+        worst = max([r["length"] / r["optimal"] for r in solved
+                     if r["optimal"]], default=1)
+
+        print("%-15s solved %d/%d, optimal %d, worst ratio %.3f, %d nodes, "
+              "%.2fs, %.0f nodes/s"
+              % (solver_tag, len(solved), len(instances), n_optimal, worst,
+                 total_nodes, total_time,
+                 total_nodes / total_time if total_time > 0 else 0))
+
+    f_name = args.output or \
+        "benchmark_" + time.strftime("%Y%m%d-%H%M%S") + ".json"
+    with open(f_name, "w") as f:
+        json.dump({
+            "commit": git_commit(),
+            "python": platform.python_version(),
+            "timestamp": time.strftime("%Y-%m-%d %H:%M:%S"),
+            "args": vars(args),
+            "records": records,
+        }, f, indent=2)
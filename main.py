@@ -1,24 +1,24 @@
 # standard modules
 import multiprocessing
 import pygame
+import queue
 import os
+import time
 
 from tkinter import *
 from tkinter import Tk, TOP, PhotoImage
 from tkinter import Label, Frame, BooleanVar, IntVar
 from tkinter import Button, Checkbutton, Radiobutton
 from argparse import Namespace
-from functools import partial
 
-from src.Astar import Astar
-from src.IDAstar import IDAstar
-from src.WAstar import WAstar
 from src.Puzzle import Puzzle
+from src.Solvers import Solvers
 from utils.utils import serialize, generate_state
 
 # font related
 FONT_COLOR = (31, 33, 43)
 FONT_SIZE = 24
+STATS_FONT_SIZE = 16
 FONT = "Courier"
 
 # user menu related
@@ -33,7 +33,9 @@ BOTTOM_OFFSET = 0
 LEFT_OFFSET = 0
 VERTICAL_OFFSET = TOP_OFFSET + BOTTOM_OFFSET
 HORIZONTAL_OFFSET = LEFT_OFFSET + RIGHT_OFFSET
-ANIMATION_FIELD_SPEED = 2
+ANIMATION_MOVE_TIME = 200  # milliseconds needed for a single move
+FRAME_RATE = 60  # number of main loop iterations per second when animating
+IDLE_FRAME_RATE = 10  # number of main loop iterations per second when idle
 BACKGROUND_COLOR = (255, 255, 255)
 
 # puzzle related
@@ -42,6 +44,11 @@ PUZZLE_IMAGES_EXT = ".png"
 PUZZLE_DIST = 25
 FIELD_SIZE = 100
 
+# solver race related
+RACE_MODE = "budget"  # one of "wait", "terminate" or "budget"
+RACE_BUDGET = 10  # seconds that slower solver gets after the faster one
+PROGRESS_INTERVAL = 20000  # number of iterations between progress reports
+
 
 class Direction:
     """
@@ -50,33 +57,18 @@ class Direction:
     UP, DOWN, LEFT, RIGHT = 1, 2, 3, 4
 
 
-class Solvers:
+class Message:
     """
-    Enum class for all available solvers.
+    Enum class for all types of messages sent by solver processes.
     """
-    ASTAR, IDASTAR, WASTAR_S, WASTAR_D = 1, 2, 3, 4
+    PROGRESS, RESULT, STOPPED = 1, 2, 3
 
-    @staticmethod
-    def get_solver_name(idx):
-        if idx == Solvers.ASTAR:
-            return "A*"
-        elif idx == Solvers.IDASTAR:
-            return "IDA*"
-        elif idx == Solvers.WASTAR_D:
-            return "Dynamic WA*"
-        elif idx == Solvers.WASTAR_S:
-            return "Static WA*"
 
-    @staticmethod
-    def get_solver_instance(idx):
-        if idx == Solvers.ASTAR:
-            return Astar
-        elif idx == Solvers.IDASTAR:
-            return IDAstar
-        elif idx == Solvers.WASTAR_D:
-            return partial(WAstar, weight=4, mode="dynamic")
-        elif idx == Solvers.WASTAR_S:
-            return partial(WAstar, weight=4, mode="static")
+class SolverStopped(Exception):
+    """
+    Raised inside solver process when it's asked to stop.
+    """
+    pass
 
 
 class ProcessSolver(multiprocessing.Process):
@@ -84,16 +76,19 @@ class ProcessSolver(multiprocessing.Process):
     Processes are used for solving puzzles.
 
     Each is runned as daemon
-    process and saves data on shared queue.
+    process and saves data on shared queue. Messages are tuples of message
+    type, position of the puzzle and data (progress statistics or puzzle).
     """
 
-    def __init__(self, solver, queue, args=None):
+    def __init__(self, solver, queue, stop_event, args=None):
         """
         Base constructor.
 
         Arguments:
             solver (BaseSolver): Puzzle solver.
             queue (Queue): Queue for placing results for each process.
+            stop_event (Event): When set, solver stops at the next progress
+                report.
             args (dict): Arguments that are passed to processes.
         """
 
@@ -101,13 +96,27 @@ class ProcessSolver(multiprocessing.Process):
 
         self._solver = solver
         self._queue = queue
+        self._stop_event = stop_event
+
+    def _report(self, stats):
+        if self._stop_event.is_set():
+            raise SolverStopped()
+
+        self._queue.put((Message.PROGRESS, self._position, stats))
 
     def run(self):
-        state, puzzle_solvability, puzzle_x, puzzle_y = self._args
+        position, state, puzzle_solvability, puzzle_x, puzzle_y = self._args
+        self._position = position
+        self._solver.set_progress(self._report, PROGRESS_INTERVAL)
 
         if puzzle_solvability:
             # if puzzle has solution we need to find one
-            result = self._solver.solve(state)
+            try:
+                result = self._solver.solve(state)
+            except SolverStopped:
+                self._queue.put((Message.STOPPED, position, None))
+                return
+
             puzzle = Puzzle(result[1][1],
                             puzzle_x, puzzle_y,
                             len(state))
@@ -117,7 +126,7 @@ class ProcessSolver(multiprocessing.Process):
                             puzzle_x, puzzle_y,
                             len(state))
 
-        self._queue.put(puzzle)
+        self._queue.put((Message.RESULT, position, puzzle))
 
 
 class UserMenu():
@@ -141,6 +150,8 @@ class UserMenu():
             solvers.append(Solvers.IDASTAR)
         if self._tk_var_astar.get():
             solvers.append(Solvers.ASTAR)
+        if self._tk_var_biastar.get():
+            solvers.append(Solvers.BIASTAR)
         self._puzzle_data["solvers"] = solvers
 
         # fetching solvers
@@ -221,6 +232,12 @@ class UserMenu():
             variable=self._tk_var_astar,
             **cb_shared_params)
         self._tk_cb_astar.pack(side=TOP, anchor=W)
+        self._tk_cb_biastar = Checkbutton(
+            self._tk_frame_cb,
+            text="Bidirectional A*",
+            variable=self._tk_var_biastar,
+            **cb_shared_params)
+        self._tk_cb_biastar.pack(side=TOP, anchor=W)
 
     def _setup_rb(self):
         """Setup all radio buttons in the user menu."""
@@ -271,6 +288,7 @@ class UserMenu():
         self._tk_var_wastar_static = BooleanVar()
         self._tk_var_idastar = BooleanVar()
         self._tk_var_astar = BooleanVar()
+        self._tk_var_biastar = BooleanVar()
         self._tk_var_puzzle_size = IntVar()
 
     def show(self):
@@ -291,28 +309,6 @@ class PuzzleManipulation:
     Abstract class for puzzle manipulation. Should not be initialized.
     """
 
-    @staticmethod
-    def get_zero_and_exchange_field(exchange_index, zero_index, value,
-                                    current_state):
-        """
-        Finding indices of exchange and empty (zero) fields.
-
-        Function defines which index corresponds to exchange and which
-        corresponds to empty (zero) field.
-
-        If the value of first field is zero, then zero field stands in position
-        of the first index in current state and exchange field belongs to other
-        index.
-
-        In other case exchange field is at the first and zero field at the
-        second index position.
-        """
-
-        if value != 0:
-            exchange_index, zero_index = zero_index, exchange_index
-
-        return current_state[zero_index], current_state[exchange_index]
-
     @staticmethod
     def define_move_direction(puzzle_size, index_src, value_src,
                               index_dest, value_dest):
@@ -352,112 +348,113 @@ class MainScene():
         self._scene_width = HORIZONTAL_OFFSET + \
             num_puzzles * self._N * FIELD_SIZE + PUZZLE_DIST
         self._scene_height = VERTICAL_OFFSET + \
-            self._N * FIELD_SIZE + FONT_SIZE
+            self._N * FIELD_SIZE + FONT_SIZE + STATS_FONT_SIZE
 
         self._solvers = puzzle_data.solvers
+        self._moves = dict()  # current move of each animated puzzle
         pygame.init()
 
-    def _move_field(self, current_state, zero_field, exchange_field, target,
-                    move_direction, puzzle_x, puzzle_y):
+    def _move_field(self, move):
         """
-        Function determines direction in which empty field is seted to be moved.
-
-        Then, function swaps fields by increasing/decresaing coordinates
-        of either empty and exchange field. If the move direction is up or down
-        only `y` coordinate should be changed (in other case only `x`
-        coordinate should be changed for both fields). It is enough to check
-        only one field coordinate (in our case we check empty field
-        coordinate).
-
-        If zero field should move up, its `y` coordinate should decrease, and
-        the sign variable is set to be negative number. With same logic we
-        define sign variable for other directions.
-
-        When we define target coordinate, its value and direction of move,
-        main loop of this function changes both coordinates of empty and
-        exchange field by increasing/decreasing them for the value of sign
-        variable.
+        Moves exchange field into the place of empty (zero) field.
+
+        Offset of exchange field depends on the time elapsed since the start
+        of the move, so every move lasts `ANIMATION_MOVE_TIME` milliseconds
+        regardless of the frame rate. Only the rectangle covering both fields
+        is repainted.
+
+        Arguments:
+            move (tuple): Move started by `_start_move`.
+
+        Returns:
+            finished (bool): If exchange field has reached its target.
         """
 
-        if move_direction == Direction.UP:
-            zero_field_variable = zero_field._y
-            sign = -ANIMATION_FIELD_SPEED
-        elif move_direction == Direction.DOWN:
-            zero_field_variable = zero_field._y
-            sign = ANIMATION_FIELD_SPEED
-        elif move_direction == Direction.LEFT:
-            zero_field_variable = zero_field._x
-            sign = -ANIMATION_FIELD_SPEED
-        else:
-            zero_field_variable = zero_field._x
-            sign = ANIMATION_FIELD_SPEED
-
-        if move_direction in [Direction.UP, Direction.LEFT]:
-            while zero_field_variable > target:
-                pygame.display.update()
-                for field in current_state:
-                    value = field._value
-                    field_x, field_y = field._x, field._y
-
-                    if value == 0:
-                        zero_field_variable += sign
-                    elif value == exchange_field._value:
-                        if move_direction in [Direction.UP]:
-                            exchange_field._y += (-sign)
-                        else:
-                            exchange_field._x += (-sign)
-                        path = os.path.join(IMAGES_PATH,
-                                            str(value) + PUZZLE_IMAGES_EXT)
-                        img = pygame.image.load(path)
-
-                        pygame.draw.rect(self._screen,
-                                         BACKGROUND_COLOR,
-                                         (field_x, field_y,
-                                          FIELD_SIZE, FIELD_SIZE))
-
-                        self._screen.blit(img, (exchange_field._x,
-                                                exchange_field._y))
-                    else:
-                        path = os.path.join(IMAGES_PATH,
-                                            str(value) + PUZZLE_IMAGES_EXT)
-                        img = pygame.image.load(path)
-                        self._screen.blit(img, (field_x, field_y))
+        exchange_field, start_x, start_y, sign_x, sign_y, dirty_rect, \
+            start_time = move
+
+        elapsed = pygame.time.get_ticks() - start_time
+        offset = min(FIELD_SIZE, elapsed * FIELD_SIZE // ANIMATION_MOVE_TIME)
+        exchange_field._x = start_x + sign_x * offset
+        exchange_field._y = start_y + sign_y * offset
+
+        self._screen.fill(BACKGROUND_COLOR, dirty_rect)
+        self._screen.blit(self._sprites[exchange_field._value],
+                          (exchange_field._x, exchange_field._y))
+
+        return offset == FIELD_SIZE
+
+    def _label_x(self, position):
+        """Returns center of labels under the puzzle on the given position."""
+        if position == 0:
+            return LEFT_OFFSET + self._N * FIELD_SIZE // 2
         else:
-            while zero_field_variable < target:
-                pygame.display.update()
-                for field in current_state:
-                    value = field._value
-                    field_x, field_y = field._x, field._y
-
-                    pygame.draw.rect(self._screen,
-                                     BACKGROUND_COLOR,
-                                     (field_x, field_y,
-                                      FIELD_SIZE, FIELD_SIZE))
-
-                    if value == 0:
-                        zero_field_variable += sign
-                    elif value == exchange_field._value:
-                        if move_direction in [Direction.DOWN]:
-                            exchange_field._y += (-sign)
-                        else:
-                            exchange_field._x += (-sign)
-                        path = os.path.join(IMAGES_PATH,
-                                            str(value) + PUZZLE_IMAGES_EXT)
-                        img = pygame.image.load(path)
-                        self._screen.blit(img, (exchange_field._x,
-                                                exchange_field._y))
-                    else:
-                        path = os.path.join(IMAGES_PATH,
-                                            str(value) + PUZZLE_IMAGES_EXT)
-                        img = pygame.image.load(path)
-                        self._screen.blit(img, (field_x, field_y))
+            return self._scene_width - RIGHT_OFFSET - \
+                self._N * FIELD_SIZE // 2
+
+    def _draw_stats(self, position, text):
+        """Replaces line of statistics under the puzzle, returns its rect."""
+        width = self._N * FIELD_SIZE
+        stats_y = TOP_OFFSET + self._N * FIELD_SIZE + FONT_SIZE
+
+        stats_rect = pygame.Rect(self._label_x(position) - width // 2,
+                                 stats_y, width, STATS_FONT_SIZE)
+        pygame.draw.rect(self._screen, BACKGROUND_COLOR, stats_rect)
+
+        text = self._stats_font.render(text, True, FONT_COLOR,
+                                       BACKGROUND_COLOR)
+        textrect = text.get_rect()
+        textrect.center = (self._label_x(position),
+                           stats_y + STATS_FONT_SIZE // 2)
+        self._screen.blit(text, textrect)
+
+        return stats_rect
+
+    def show_progress(self, position, stats):
+        """
+        Shows live search statistics of the solver.
+
+        Arguments:
+            position (int): Position of the puzzle (0 or 1).
+            stats (dict): Progress report of the solver.
+
+        Returns:
+            rect (Rect): Part of the scene that has changed.
+        """
+
+        return self._draw_stats(position, "nodes: %d  f: %s  open: %d" %
+                                (stats["n_iters"], stats["f"],
+                                 stats["open"]))
+
+    def show_stopped(self, position):
+        """Shows that solver was stopped after the other one has finished."""
+        return self._draw_stats(position, "stopped")
+
+    def _load_sprites(self):
+        """
+        Loads images of all fields, stop sign and solver names once.
+
+        Images are converted to the display format, so drawing them is only
+        blitting. All drawing functions share these sprites.
+        """
+
+        self._sprites = dict()
+        for value in range(1, self._N * self._N):
+            path = os.path.join(IMAGES_PATH, str(value) + PUZZLE_IMAGES_EXT)
+            self._sprites[value] = pygame.image.load(path).convert_alpha()
+
+        path = os.path.join(IMAGES_PATH, "stop" + PUZZLE_IMAGES_EXT)
+        self._sprites["stop"] = pygame.image.load(path).convert_alpha()
 
-    def _setup_text(self):
         font = pygame.font.Font("./src/fonts/calibri.ttf", FONT_SIZE)
         shared_params = [True, FONT_COLOR, BACKGROUND_COLOR]
+        self._sprites["solvers"] = [
+            font.render(Solvers.get_solver_name(solver),
+                        *shared_params).convert()
+            for solver in self._solvers]
 
-        solver_left = Solvers.get_solver_name(self._solvers[0])
-        text_left = font.render(solver_left, *shared_params)
+    def _setup_text(self):
+        text_left, text_right = self._sprites["solvers"]
         textrect_left = text_left.get_rect()
 
         left_x = LEFT_OFFSET + self._N * FIELD_SIZE // 2
@@ -465,8 +462,6 @@ class MainScene():
         textrect_left.center = (left_x, left_y)
         self._screen.blit(text_left, textrect_left)
 
-        solver_right = Solvers.get_solver_name(self._solvers[1])
-        text_right = font.render(solver_right, *shared_params)
         textrect_right = text_right.get_rect()
 
         right_x = self._scene_width - RIGHT_OFFSET - self._N * FIELD_SIZE // 2
@@ -474,7 +469,7 @@ class MainScene():
         textrect_right.center = (right_x, right_y)
         self._screen.blit(text_right, textrect_right)
 
-    def _draw_puzzle(self, current_state, puzzle_solvability):
+    def draw_puzzle(self, puzzle, puzzle_solvability):
         """
         Function iterates through current state of the puzzle.
 
@@ -482,88 +477,129 @@ class MainScene():
 
         In the place of empty(zero) field nothing should be draw so we
         skip the field with value 0.
+
+        Arguments:
+            puzzle (Puzzle): Puzzle that is drawn.
+            puzzle_solvability (bool): If puzzle has solution.
+
+        Returns:
+            rects (list): Parts of the scene that have changed.
         """
 
-        for field in current_state:
+        puzzle_x, puzzle_y = puzzle.get_puzzle_coordinates()
+        dimension = puzzle.get_puzzle_size() * FIELD_SIZE
+        rects = [pygame.Rect(puzzle_x, puzzle_y, dimension, dimension)]
+
+        for field in puzzle._fields:
             value = field._value
             field_x, field_y = field._x, field._y
 
             if value == 0:
                 continue
 
-            path = os.path.join(IMAGES_PATH, str(value) + PUZZLE_IMAGES_EXT)
-            img = pygame.image.load(path)
-            self._screen.blit(img, (field_x, field_y))
+            self._screen.blit(self._sprites[value], (field_x, field_y))
 
         # when puzzle doesn't have solution
         if not puzzle_solvability:
-            img = pygame.image.load(os.path.join(IMAGES_PATH, "stop.png"))
+            img = self._sprites["stop"]
             img_width, img_height = img.get_size()
-            self._screen.blit(img, (self._scene_width // 2 - img_width // 2,
-                                    self._scene_height // 2 - img_height // 2))
+            rects.append(self._screen.blit(
+                img, (self._scene_width // 2 - img_width // 2,
+                      self._scene_height // 2 - img_height // 2)))
 
-    def solve_puzzle(self, puzzle, puzzle_solvability):
-        """
-        Function gets current state of puzzle, draws puzzle, gets
-        difference between current and the next state of the puzzle, and makes
-        transition from current to the next state.
-        """
+        return rects
 
-        current_state = puzzle._fields
-        puzzle_x, puzzle_y = puzzle.get_puzzle_coordinates()
+    def _start_move(self, puzzle):
+        """
+        Function gets the next move of the puzzle and starts transition from
+        current to the next state.
 
-        # draw state without animation
-        self._draw_puzzle(current_state, puzzle_solvability)
+        Exchange field moves in the direction opposite to the move direction
+        of empty field.
 
-        # get difference between current and next state
-        # in new puzzle state we will have value_cur in field with index_cur
-        # and value_next in field with index_next
-        if puzzle.next_puzzle_state() is not None:
-            index_cur, value_cur, index_next, value_next = \
-                puzzle.states_difference(
-                    puzzle.current_puzzle_state(),
-                    puzzle.next_puzzle_state())
+        Returns:
+            move (tuple): Exchange field, its starting coordinates, direction
+                of its movement, rectangle covering both fields and starting
+                time of the move, `None` if there are no further moves.
+        """
 
+        # positions of empty field and the field exchanged with it
+        if puzzle.next_move() is not None:
+            zero_index, exchange_index = puzzle.next_move()
         else:
-            return False  # no further moves
+            return None  # no further moves
+
+        # get fields for animation
+        zero_field = puzzle._fields[zero_index]
+        exchange_field = puzzle._fields[exchange_index]
 
         # define direction of field movement
         move_direction = PuzzleManipulation.define_move_direction(
             puzzle.get_puzzle_size(),
-            index_cur,
-            value_cur,
-            index_next,
-            value_next)
-
-        # get fields for animation
-        exchange_field, zero_field = \
-            PuzzleManipulation.get_zero_and_exchange_field(index_cur,
-                                                           index_next,
-                                                           value_cur,
-                                                           current_state)
+            zero_index,
+            zero_field._value,
+            exchange_index,
+            exchange_field._value)
 
-        # define stop targets for animation
-        target_x, target_y = exchange_field._x, exchange_field._y
-
-        # move zero field to seted direction
         if move_direction == Direction.UP:
-            self._move_field(current_state, zero_field, exchange_field,
-                             target_y, Direction.UP, puzzle_x, puzzle_y)
+            sign_x, sign_y = 0, 1
         elif move_direction == Direction.DOWN:
-            self._move_field(current_state, zero_field, exchange_field,
-                             target_y, Direction.DOWN, puzzle_x, puzzle_y)
-        elif move_direction == Direction.RIGHT:
-            self._move_field(current_state, zero_field, exchange_field,
-                             target_x, Direction.RIGHT, puzzle_x, puzzle_y)
+            sign_x, sign_y = 0, -1
         elif move_direction == Direction.LEFT:
-            self._move_field(current_state, zero_field, exchange_field,
-                             target_x, Direction.LEFT, puzzle_x, puzzle_y)
+            sign_x, sign_y = 1, 0
+        elif move_direction == Direction.RIGHT:
+            sign_x, sign_y = -1, 0
         else:
             raise ValueError("Invalid move_direction")  # should never happen
 
-        puzzle.states_change()
+        start_x, start_y = exchange_field._x, exchange_field._y
+        dirty_rect = pygame.Rect(start_x, start_y, FIELD_SIZE, FIELD_SIZE) \
+            .union((zero_field._x, zero_field._y, FIELD_SIZE, FIELD_SIZE))
 
-        return True  # valid move has happened
+        return (exchange_field, start_x, start_y, sign_x, sign_y, dirty_rect,
+                pygame.time.get_ticks())
+
+    def solve_puzzle(self, puzzle):
+        """
+        Advances animation of the puzzle by a single frame.
+
+        Next move is started once the previous one is finished, so any number
+        of puzzles can be animated at the same time from the main loop.
+        Puzzle has to be drawn (see `draw_puzzle`) before the first move,
+        after that only moved fields are repainted.
+
+        Arguments:
+            puzzle (Puzzle): Puzzle that is animated.
+
+        Returns:
+            rect (Rect): Part of the scene that has changed, `None` if there
+                are no further moves.
+        """
+
+        move = self._moves.get(puzzle)
+        if move is None:
+            move = self._start_move(puzzle)
+            if move is None:
+                return None  # no further moves
+
+            self._moves[puzzle] = move
+
+        if self._move_field(move):
+            del self._moves[puzzle]
+            puzzle.states_change()
+
+        return move[5]
+
+    def wait(self, animating):
+        """
+        Sleeps until the next iteration of the main loop.
+
+        Arguments:
+            animating (bool): If any puzzle is animated, frame rate is
+                `FRAME_RATE`, otherwise `IDLE_FRAME_RATE`.
+        """
+
+        self._clock.tick(FRAME_RATE if animating else IDLE_FRAME_RATE)
 
     def _setup_scene(self):
         pygame.display.set_caption("Loyd Puzzle A* Solvers")
@@ -590,8 +626,13 @@ class MainScene():
         pygame.init()
         self._screen = pygame.display.set_mode((self._scene_width,
                                                 self._scene_height))
+        self._stats_font = pygame.font.Font("./src/fonts/calibri.ttf",
+                                            STATS_FONT_SIZE)
+        self._clock = pygame.time.Clock()
+        self._load_sprites()
         self._setup_scene()
         self._setup_text()
+        pygame.display.update()
 
 
 if __name__ == "__main__":
@@ -619,26 +660,66 @@ if __name__ == "__main__":
 
     # running daemon processes for each algorithm
     results_queue = multiprocessing.Queue()
-    for solver, state, offset_x, offset_y in multiprocessing_data:
-        args = (state, puzzle_solvability, offset_x, offset_y)
-        cur_process = ProcessSolver(solver, results_queue, args=args)
+    stop_events = []
+    for position, (solver, state, offset_x, offset_y) in \
+            enumerate(multiprocessing_data):
+        args = (position, state, puzzle_solvability, offset_x, offset_y)
+        stop_events.append(multiprocessing.Event())
+        cur_process = ProcessSolver(solver, results_queue, stop_events[-1],
+                                    args=args)
         cur_process.start()
 
+    active_puzzles = []
+    finished = [False] * len(multiprocessing_data)
+    race_finish_time = None  # time when the faster solver has finished
+
     # Pygame main loop
     loop_active = True
     while loop_active:
+        dirty_rects = []  # parts of the scene that have to be updated
+
         for event in pygame.event.get():
             if event.type == pygame.QUIT:
                 loop_active = False
 
-        cur_qsize = results_queue.qsize()
-        while cur_qsize > 0:
-            cur_qsize -= 1
-            cur_puzzle = results_queue.get()
-            flag = main_scene.solve_puzzle(cur_puzzle, puzzle_solvability)
-
-            if flag:
-                results_queue.put(cur_puzzle)
-
-        # redisplay and wait for next iteration
-        pygame.display.update()
+        # fetching progress reports and results without blocking
+        while True:
+            try:
+                message, position, data = results_queue.get_nowait()
+            except queue.Empty:
+                break
+
+            if message == Message.PROGRESS:
+                dirty_rects.append(main_scene.show_progress(position, data))
+            elif message == Message.STOPPED:
+                dirty_rects.append(main_scene.show_stopped(position))
+            else:
+                finished[position] = True
+                active_puzzles.append(data)
+                dirty_rects.extend(main_scene.draw_puzzle(data,
+                                                          puzzle_solvability))
+
+                if race_finish_time is None:
+                    race_finish_time = time.time()
+
+        # stopping the slower solver depending on race mode
+        if race_finish_time is not None and RACE_MODE != "wait":
+            if RACE_MODE == "terminate" or \
+                    time.time() - race_finish_time > RACE_BUDGET:
+                for position, stop_event in enumerate(stop_events):
+                    if not finished[position]:
+                        stop_event.set()
+
+        # advancing all animations by a single frame
+        for cur_puzzle in list(active_puzzles):
+            rect = main_scene.solve_puzzle(cur_puzzle)
+
+            if rect is None:
+                active_puzzles.remove(cur_puzzle)
+            else:
+                dirty_rects.append(rect)
+
+        if len(dirty_rects) > 0:
+            pygame.display.update(dirty_rects)
+
+        main_scene.wait(len(active_puzzles) > 0)
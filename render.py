@@ -0,0 +1,70 @@
+import argparse
+import json
+import os
+import sys
+
+# rendering doesn't need a window
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+
+from src.Renderer import Renderer  # noqa: E402
+
+
+def read_results(f_name):
+    r"""
+    Reads results printed by `batch.py --paths`, one JSON object per line.
+
+    Only solved puzzles (results with a path) are returned. Lines that
+    aren't results (e.g. other output mixed into the file) are skipped with
+    a warning.
+    """
+
+    results = []
+    with open(f_name) as f:
+        for line_number, line in enumerate(f, 1):
+            line = line.strip()
+            if not line:
+                continue
+
+            try:
+                result = json.loads(line)
+            except ValueError:
+                result = None
+            if not isinstance(result, dict):
+                print("%s:%d: skipping line that isn't a result" %
+                      (f_name, line_number), file=sys.stderr)
+                continue
+
+            if result.get("path"):
+                results.append(result)
+
+    return results
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Renders solutions to numbered PNG frames. Frames of "
+                    "each solution can be joined into a video, e.g. with "
+                    "`ffmpeg -framerate 30 -i frame_%%05d.png out.mp4`.")
+    parser.add_argument("--input", type=str, required=True,
+                        help="Output of batch.py with --paths.")
+    parser.add_argument("--output", type=str, required=True,
+                        help="Directory with a subdirectory per solution.")
+    parser.add_argument("--fps", type=int, default=30,
+                        help="Number of frames per second.")
+    parser.add_argument("--move_time", type=int, default=200,
+                        help="Duration of a single move in milliseconds.")
+    parser.add_argument("--label", type=str, default=None,
+                        help="Text under the puzzle, e.g. solver name.")
+    args = parser.parse_args()
+
+    renderers = {}  # one renderer (and its sprites) per puzzle size
+    for result in read_results(args.input):
+        N = int(round(len(result["path"][0].split(":")) ** 0.5))
+        if N not in renderers:
+            renderers[N] = Renderer(N, args.fps, args.move_time)
+
+        directory = os.path.join(args.output, "%05d" % result["idx"])
+        n_frames = renderers[N].save_frames(result["path"], directory,
+                                            args.label)
+        print("%s: %d moves, %d frames" % (directory,
+                                           len(result["path"]) - 1, n_frames))
@@ -0,0 +1,238 @@
+from .BaseSolver import Status
+from .Budget import BudgetExceeded
+from .OpenList import get_open_list
+from .WAstar import WAstar
+from utils.utils import pack, blank_index, is_solvable
+
+
+class ARAstar(WAstar):
+    """
+    Anytime repairing A* (ARA*).
+
+    Weighted search with static weighting quickly finds the first path. Then
+    weight is decreased and search continues with the states it has already
+    reached instead of starting over: states whose distance improved after
+    expansion are kept aside as inconsistent and only they are expanded
+    again. Each improved path is published along with its suboptimality
+    bound. With weight 1 improved states are reopened instead, so the last
+    path is optimal even if heuristics is admissible but not consistent.
+    """
+
+    OPTIMAL = True  # only paths with bound 1 are cached (see `_cacheable`)
+
+    def __init__(self, N, weight=3, weight_step=0.5, heuristic="manhattan",
+                 randomize=False):
+        """
+        Base constructor.
+
+        Weight changes between iterations, so f scores aren't integers and
+        heap open list is always used.
+
+        Arguments:
+            N (int): Size of puzzle.
+            weight (number): Initial multiplier of heuristics, at least 1.
+            weight_step (number): Decrease of weight after each path.
+            heuristic (str or Heuristic): Heuristics (see `HEURISTICS`).
+            randomize (bool): If neighbors should be randomly shuffled.
+        """
+
+        super().__init__(N, weight, mode="static", heuristic=heuristic,
+                         open_list="heap", randomize=randomize)
+
+        if weight_step <= 0:
+            raise ValueError("Invalid weight step")
+
+        self._weight_step = weight_step
+        self._solution_callback = None
+
+    def set_solution_callback(self, callback):
+        """
+        Sets callback for publishing improved paths.
+
+        Callback is called with dictionary containing path (`path`), its
+        length (`length`), suboptimality bound (`bound`) and number of
+        iterations so far (`n_iters`) every time a shorter path is found.
+
+        Arguments:
+            callback (callable): Solution callback, `None` disables it.
+        """
+
+        self._solution_callback = callback
+
+    def _bound(self, nodes, open_nodes, incons, length):
+        """
+        Returns suboptimality bound of the path with the given length.
+
+        Bound is ratio of the path length and the lowest unweighted f score
+        of all open and inconsistent states. Some state on the optimal path
+        is always among them with its optimal distance, so the lowest f score
+        never exceeds the optimal length as long as heuristics is admissible,
+        even if it isn't consistent.
+        """
+
+        lower = min([(nodes[state] >> 2) + h
+                     for states in (open_nodes, incons)
+                     for state, (_, h, _) in states.items()],
+                    default=float("inf"))
+
+        return max(1, length / lower)
+
+    def _publish(self, nodes, bound, n_iters):
+        """
+        Publishes path to the final state along with its bound.
+
+        Returns:
+            path (list): Serialized states.
+        """
+
+        path = self._serialize_path(self._trace_path(nodes, self._end_state,
+                                                     0))
+        if self._solution_callback is not None:
+            self._solution_callback({"path": path, "length": len(path) - 1,
+                                     "bound": bound, "n_iters": n_iters})
+
+        return path
+
+    def _cacheable(self):
+        # only paths proved to be optimal are shared with optimal solvers
+        return self._stats.get("bound") == 1
+
+    def _solve(self, start_state):
+        """
+        Solving given puzzle.
+
+        Search runs until the optimal path is found or budget is exceeded.
+        In the latter case the best path found so far is returned and its
+        bound is available in `get_stats`.
+
+        Arguments:
+            start_state (list or np.ndarray): Starting state.
+
+        Returns:
+            flag (Status): If puzzle is solved, unsolvable or budget was
+                exceeded before any path was found.
+            n_iters (int): Number of iterations.
+
+        """
+
+        self._start_state = pack(start_state)
+        self._start_blank = blank_index(self._start_state, self._N)
+        n_iters = 0
+        next_check = self._start_search()
+
+        # trivial check if the given puzzle can be solved or not
+        if not is_solvable(self._start_state, self._N):
+            return self._finish(Status.UNSOLVABLE, n_iters, None, 0)
+
+        # distance and generating move of each node, packed into one integer
+        nodes = {self._start_state: 0}
+
+        # open and inconsistent states with their blank, heuristics and aux,
+        # states expanded with the current weight
+        start_h, start_aux = self._h(self._start_state)
+        open_nodes = {self._start_state: (self._start_blank, start_h,
+                                          start_aux)}
+        incons, closed = {}, set()
+
+        move_index = self._move_index
+        update_h = self._heuristic.update
+        weight, path, bound = self._weight, None, None
+
+        while True:
+            open_list = get_open_list(self._open_list)
+            for state, (blank, h_val, aux) in open_nodes.items():
+                g_val = nodes[state] >> 2
+                open_list.push(g_val + weight * h_val, g_val,
+                               (state, blank, g_val, h_val, aux))
+
+            # improving path until no open state can lead to a shorter one
+            while len(open_list) > 0:
+                goal_code = nodes.get(self._end_state)
+                if goal_code is not None and \
+                        goal_code >> 2 <= open_list.min_f():
+                    break
+
+                state, blank, g_val, h_val, aux = open_list.pop()
+
+                if g_val > nodes[state] >> 2 or state in closed:
+                    continue  # state was reached by shorter path
+
+                del open_nodes[state]
+                closed.add(state)
+
+                n_iters += 1
+                if n_iters == next_check:
+                    try:
+                        next_check = self._checkpoint(
+                            n_iters, g_val + weight * h_val, len(open_list),
+                            len(nodes))
+                    except BudgetExceeded as e:
+                        if path is None:
+                            return self._finish(Status.BUDGET_EXCEEDED,
+                                                n_iters, None, len(nodes),
+                                                e.reason)
+
+                        result = self._finish(Status.SOLVED, n_iters, path,
+                                              len(nodes), e.reason)
+                        self._stats["bound"] = bound
+
+                        return result
+
+                for next_state, next_blank, tile in self._get_neighbors(
+                        state, blank):
+                    cur_dist = g_val + 1
+                    code = nodes.get(next_state)
+
+                    if code is None or cur_dist < code >> 2:  # relax
+                        nodes[next_state] = (cur_dist << 2) | \
+                            move_index[next_blank - blank]
+
+                        next_h, next_aux = update_h(h_val, aux, next_state,
+                                                    tile, next_blank, blank)
+                        node = (next_blank, next_h, next_aux)
+
+                        if next_state in closed and weight > 1:
+                            incons[next_state] = node
+                        else:
+                            # with weight 1 improved states are reopened as
+                            # in A*, since heuristics may be inconsistent
+                            closed.discard(next_state)
+                            open_nodes[next_state] = node
+                            open_list.push(cur_dist + weight * next_h,
+                                           cur_dist,
+                                           (next_state, next_blank, cur_dist,
+                                            next_h, next_aux))
+
+            goal_code = nodes.get(self._end_state)
+            if goal_code is None:
+                return self._finish(Status.UNSOLVABLE, n_iters, None,
+                                    len(nodes))
+
+            bound = self._bound(nodes, open_nodes, incons, goal_code >> 2)
+            if path is None or goal_code >> 2 < len(path) - 1:
+                path = self._publish(nodes, bound, n_iters)
+
+            if weight <= 1 or bound <= 1:
+                result = self._finish(Status.SOLVED, n_iters, path,
+                                      len(nodes))
+                self._stats["bound"] = bound
+
+                return result
+
+            # inconsistent states are searched again with the lower weight
+            weight = max(1, weight - self._weight_step)
+            open_nodes.update(incons)
+            incons, closed = {}, set()
+
+
+if __name__ == "__main__":
+    starting_states = [
+        [[7, 1, 2], [0, 8, 3], [6, 4, 5]],
+        [[8, 5, 9, 11], [7, 12, 10, 4], [0, 15, 13, 14], [1, 2, 6, 3]],
+    ]
+
+    for state in starting_states:
+        solver = ARAstar(len(state))
+        solver.set_solution_callback(
+            lambda solution: print(solution["length"], solution["bound"]))
+        print(solver.solve(state)[1][0])
@@ -1,7 +1,7 @@
-import heapq
-
-from .BaseSolver import BaseSolver
-from utils.utils import reconstruct_path, serialize, is_solvable, h
+from .BaseSolver import BaseSolver, Status
+from .Budget import BudgetExceeded
+from .OpenList import get_open_list
+from utils.utils import pack, blank_index, is_solvable
 
 
 class Astar(BaseSolver):
@@ -11,67 +11,98 @@ class Astar(BaseSolver):
     Heuristics is monotone which guarantees optimal time cost.
     """
 
-    def __init__(self, N):
+    def __init__(self, N, heuristic="manhattan", open_list="bucket",
+                 randomize=False):
         """
         Base constructor.
 
         Arguments:
             N (int): puzzle size.
+            heuristic (str or Heuristic): Heuristics (see `HEURISTICS`).
+            open_list (str): Open list (see `OPEN_LISTS`).
+            randomize (bool): If neighbors should be randomly shuffled.
         """
 
-        super().__init__(N)
+        super().__init__(N, heuristic=heuristic, randomize=randomize)
+
+        get_open_list(open_list)  # verifying that open list exists
+        self._open_list = open_list
 
-    def solve(self, start_state):
+    def _solve(self, start_state):
         """
         Solving given puzzle.
 
         This implementation assumes that given heurstics is consistent meaning
         that it's sufficient to relax distance the moment it becomes possible
         and such action will never be possible in the future. Manhattan
-        distance is used.
+        distance is used by default.
 
         Arguments:
             start_state (list or np.ndarray): Starting state.
         Returns:
-            flag (bool): If puzzle is solvable.
+            flag (Status): If puzzle is solved, unsolvable or budget was
+                exceeded.
             n_iters (int): Number of iterations.
         """
 
-        self._start_state = serialize(start_state)
+        self._start_state = pack(start_state)
+        self._start_blank = blank_index(self._start_state, self._N)
         n_iters = 0
+        next_check = self._start_search()
 
         # trivial check if the given puzzle can be solved or not
-        if not is_solvable(self._start_state):
-            return False, (n_iters, None)
+        if not is_solvable(self._start_state, self._N):
+            return self._finish(Status.UNSOLVABLE, n_iters, None, 0)
 
-        # initializing dictionaries for distances and parents
-        dist, parent = {}, {}
-        dist[self._start_state], parent[self._start_state] = 0, None
+        # distance and generating move of each node, packed into one integer
+        nodes = {self._start_state: 0}
 
-        min_heap = []  # this list is used as Min-Heap
-        heapq.heappush(min_heap, (h(self._start_state), self._start_state))
+        move_index = self._move_index
+        update_h = self._heuristic.update
+        open_list = get_open_list(self._open_list)
+        start_h, start_aux = self._h(self._start_state)
+        open_list.push(start_h, 0, (self._start_state, self._start_blank, 0,
+                                    start_h, start_aux))
 
-        while len(min_heap) > 0:
-            _, state = heapq.heappop(min_heap)
+        while len(open_list) > 0:
+            state, blank, g_val, h_val, aux = open_list.pop()
+
+            if g_val > nodes[state] >> 2:  # state was reached by shorter path
+                continue
 
             if state == self._end_state:
-                path = reconstruct_path(parent, state)
+                path = self._serialize_path(
+                    self._trace_path(nodes, state, blank))
 
-                return True, (n_iters, path)
+                return self._finish(Status.SOLVED, n_iters, path, len(nodes))
             else:
                 n_iters += 1
-
-                for next_state, w in self._get_neighbors(state):
-                    cur_dist = dist[state] + w
-
-                    if cur_dist < dist.get(next_state, float("inf")):  # relax
-                        dist[next_state] = cur_dist
-                        parent[next_state] = state
-                        cost_guess = cur_dist + h(next_state)
-
-                        heapq.heappush(min_heap, (cost_guess, next_state))
-
-        return False, (n_iters, None)
+                if n_iters == next_check:
+                    try:
+                        next_check = self._checkpoint(
+                            n_iters, g_val + h_val, len(open_list),
+                            len(nodes))
+                    except BudgetExceeded as e:
+                        return self._finish(Status.BUDGET_EXCEEDED, n_iters,
+                                            None, len(nodes), e.reason)
+
+                for next_state, next_blank, tile in self._get_neighbors(
+                        state, blank):
+                    cur_dist = g_val + 1
+                    code = nodes.get(next_state)
+
+                    if code is None or cur_dist < code >> 2:  # relax
+                        nodes[next_state] = (cur_dist << 2) | \
+                            move_index[next_blank - blank]
+                        next_h, next_aux = update_h(h_val, aux, next_state,
+                                                    tile, next_blank, blank)
+                        cost_guess = cur_dist + next_h
+
+                        open_list.push(cost_guess, cur_dist,
+                                       (next_state, next_blank, cur_dist,
+                                        next_h, next_aux))
+
+        return self._finish(Status.UNSOLVABLE, n_iters, None, len(nodes))
 
 
 if __name__ == "__main__":
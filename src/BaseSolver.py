@@ -1,8 +1,21 @@
 import random
+import time
 
 import numpy as np
 
-from utils.utils import serialize, deserialize
+from .Heuristic import get_heuristic
+from utils.utils import pack, unpack, serialize, move_table, move_deltas, \
+    blank_index
+
+
+class Status:
+    """
+    Enum class for results of `solve`.
+
+    Budget exceeded status is falsy like unsolvable one, so callers that only
+    check the flag treat it as failure, but it can still be distinguished.
+    """
+    SOLVED, UNSOLVABLE, BUDGET_EXCEEDED = True, False, None
 
 
 class BaseSolver:
@@ -11,74 +24,356 @@ class BaseSolver:
 
     It doesn't implement any algorithm
     and it's expected that any of such extends this class. It provides general
-    and useful functions for easier implementation of algorithms.
+    and useful functions for easier implementation of algorithms. Subclasses
+    implement `_solve`, while `solve` looks up solutions in the cache first.
+
+    Internally every state is represented as a packed integer (see
+    `utils.utils.pack`) along with the position of its blank tile. Serialized
+    strings are used only for the paths returned to the caller.
     """
 
-    def __init__(self, N):
+    # if returned paths are always optimal
+    OPTIMAL = True
+
+    def __init__(self, N, heuristic="manhattan", randomize=False):
         """
         Initializing puzzle.
 
         It's assumed that final position has blank tile in upper-left corner.
 
         Arguments:
-            start_state (list): Starting state.
+            N (int): Puzzle size.
+            heuristic (str or Heuristic): Heuristics (see `HEURISTICS`).
+            randomize (bool): If neighbors should be randomly shuffled.
         """
 
         self._N = N
         self._N2 = N * N
+        self._randomize = randomize
+        self._moves = move_table(N)
+        self._deltas = move_deltas(N)
+        # index of move for each change of blank position, it fits in 2 bits
+        self._move_index = {d: i for i, d in enumerate(self._deltas)}
+        self._heuristic = get_heuristic(heuristic, N)
+        self._progress, self._progress_interval = None, None
+        self._budget, self._stats = None, None
+        self._cache = None
 
         end_state = np.arange(self._N2).reshape((self._N, self._N))
-        self._end_state = serialize(end_state)
+        self._end_state = pack(end_state)
+
+    def set_progress(self, callback, interval=10000):
+        """
+        Sets callback for periodic progress reports.
+
+        Callback is called with dictionary containing number of iterations
+        (`n_iters`), current f bound (`f`) and size of open list or current
+        path (`open`) every `interval` iterations.
+
+        Arguments:
+            callback (callable): Progress callback, `None` disables reports.
+            interval (int): Number of iterations between two reports.
+        """
+
+        self._progress, self._progress_interval = callback, interval
+
+    def set_budget(self, budget):
+        """
+        Sets limits of every following run.
+
+        When any limit is exceeded, `solve` returns `Status.BUDGET_EXCEEDED`
+        and the reason is available in `get_stats`.
+
+        Arguments:
+            budget (Budget): Solver budget, `None` removes limits.
+        """
+
+        self._budget = budget
+
+    def set_cache(self, cache):
+        """
+        Sets cache of solutions shared by solvers of the same configuration.
+
+        Arguments:
+            cache (SolutionCache): Solution cache, `None` disables it.
+        """
+
+        self._cache = cache
+
+    def config_key(self):
+        """
+        Returns key of solver configuration used by solution cache.
+
+        All optimal solvers return paths of the same length, so they share
+        the same key. Otherwise, key contains solver and its parameters.
+
+        Returns:
+            key (str): Configuration key.
+        """
+
+        if self.OPTIMAL:
+            return "optimal"
+
+        params = ["%s=%s" % item for item in sorted(self._config().items())]
+
+        return ":".join([type(self).__name__] + params)
+
+    def _config(self):
+        """Returns parameters that affect returned paths."""
+        return {"heuristic": self._heuristic.name}
+
+    def get_stats(self):
+        """
+        Returns statistics of the last run.
+
+        Returns:
+            stats (dict): Number of iterations (`n_iters`), maximum number of
+                states kept in memory (`closed`), wall time (`time`), reason
+                why budget was exceeded (`reason`, `None` otherwise) and if
+                solution was found in the cache (`cached`).
+        """
+
+        return self._stats
+
+    def _start_search(self):
+        """
+        Starts measuring a new run.
+
+        Returns:
+            next_check (int): Number of iterations of the first checkpoint.
+        """
+
+        self._start_time = time.time()
+        if self._budget is not None:
+            self._budget.start()
+
+        self._next_report = -1
+        if self._progress is not None:
+            self._next_report = self._progress_interval
+
+        return self._next_checkpoint(0)
+
+    def _next_checkpoint(self, n_iters):
+        next_check = self._next_report
+        if self._budget is not None:
+            budget_check = self._budget.next_check(n_iters)
+            if next_check == -1 or budget_check < next_check:
+                next_check = budget_check
+
+        return next_check
+
+    def _checkpoint(self, n_iters, f, open_size, closed_size):
+        """
+        Reports progress and checks budget.
+
+        Solvers compare number of iterations with returned value, so there is
+        a single comparison per iteration (-1 is returned when there are no
+        reports nor budget). BudgetExceeded will be raised if any limit is
+        exceeded.
+
+        Arguments:
+            n_iters (int): Number of iterations.
+            f (number): Current f bound.
+            open_size (int): Size of open list.
+            closed_size (int): Number of states kept in memory.
+
+        Returns:
+            next_check (int): Number of iterations of the next checkpoint.
+        """
+
+        if 0 <= self._next_report <= n_iters:
+            self._progress({"n_iters": n_iters, "f": f, "open": open_size})
+            self._next_report = n_iters + self._progress_interval
+
+        if self._budget is not None:
+            self._budget.check(n_iters, closed_size)
 
-    def _get_neighbors(self, state):
+        return self._next_checkpoint(n_iters)
+
+    def _finish(self, status, n_iters, path, closed_size, reason=None):
+        """
+        Saves statistics of the run and returns result of `solve`.
+
+        Arguments:
+            status (Status): Result of the run.
+            n_iters (int): Number of iterations.
+            path (list): Serialized states, `None` if there is no path.
+            closed_size (int): Number of states kept in memory.
+            reason (str): Reason why budget was exceeded.
+
+        Returns:
+            flag (Status): Result of the run.
+            n_iters (int): Number of iterations.
+            path (list): Serialized states.
+        """
+
+        self._stats = {
+            "n_iters": n_iters,
+            "closed": closed_size,
+            "time": time.time() - self._start_time,
+            "reason": reason,
+            "cached": False,
+        }
+
+        return status, (n_iters, path)
+
+    def _get_neighbors(self, state, blank):
         """"
         Returns all states that can be directly obtained from the given state.
 
-        These states are randomly shuffled before returned along with proper
-        (unit) weights.
+        Legal moves are taken from precomputed move table and tile is moved
+        into the blank directly in the packed state. Moves are randomly
+        shuffled only if solver is created with `randomize` flag.
 
         Arguments:
-            state (str, list or np.ndarray): Given state.
+            state (int): Given packed state.
+            blank (int): Position of blank tile in the given state.
 
         Returns:
-            iterable (zip): Tuples of states and weights.
+            iterable (generator): Tuples of states, positions of blank tile
+                and moved tiles. Every move has unit weight.
+
+        """
+
+        moves = self._moves[blank]
+        if self._randomize:
+            moves = random.sample(moves, len(moves))
 
+        blank_shift = blank << 2
+        for target, shift in moves:
+            tile = (state >> shift) & 15
+            # blank tile is zero so swapping is just moving one tile
+            yield state + (tile << blank_shift) - (tile << shift), target, tile
+
+    def _h(self, state):
         """
+        Full evaluation of heuristics for the given packed state.
 
-        def _is_valid(r, c):
-            """
-            Helper function for veryfing valid moves.
+        Solvers call this only for the starting state, every other state is
+        evaluated incrementally from its parent.
 
-            Arguments:
-                r (int) Row of blank tile.
-                c (int): Column of blank tile.
-            """
+        Arguments:
+            state (int): Given packed state.
 
-            return r >= 0 and c >= 0 and r < self._N and c < self._N
+        Returns:
+            h (int): Heuristic value.
+            aux (object): Auxiliary value for further updates.
+        """
 
-        # state should be np.ndarray because of further calculations
-        if isinstance(state, str):
-            state = deserialize(state)
-        elif isinstance(state, list):
-            state = np.array(state)
+        return self._heuristic.evaluate(state)
 
-        # there is only one blank tile
-        br, bc = np.squeeze(np.argwhere(state == 0))
+    def _replay_path(self, state, blank, blanks):
+        """
+        Reconstructs path of states by replaying moves.
 
-        # shuffling all possible moves
-        moves = [(br + 1, bc), (br - 1, bc), (br, bc + 1), (br, bc - 1)]
-        random.shuffle(moves)
+        Arguments:
+            state (int): Starting packed state.
+            blank (int): Position of blank tile in the starting state.
+            blanks (list): Positions of blank tile after each move.
 
-        neighbors = []
+        Returns:
+            path (list): Packed states.
+        """
 
-        for xt_r, xt_c in moves:
-            if _is_valid(xt_r, xt_c):  # veryifing correctness
-                new_state = np.copy(state)
-                new_state[br, bc], new_state[xt_r, xt_c] = \
-                    new_state[xt_r, xt_c], new_state[br, bc]  # swapping
-                neighbors.append(serialize(new_state))
+        path = [state]
+        for next_blank in blanks:
+            tile = (state >> (next_blank << 2)) & 15
+            state += (tile << (blank << 2)) - (tile << (next_blank << 2))
+            blank = next_blank
+            path.append(state)
 
-        return zip(neighbors, [1] * len(neighbors))
+        return path
+
+    def _trace_path(self, nodes, state, blank):
+        """
+        Reconstructs path to the given state by undoing generating moves.
+
+        Each node is stored as a single integer `g << 2 | move` where `move`
+        is index of the move (see `move_deltas`) that generated the state
+        from its parent. Parent is therefore obtained by moving the blank tile
+        back, until the starting state (with zero distance) is reached.
+
+        Arguments:
+            nodes (dict): Packed codes of nodes indexed by packed states.
+            state (int): Terminating packed state.
+            blank (int): Position of blank tile in the terminating state.
+
+        Returns:
+            path (list): Packed states from the starting one.
+        """
+
+        path = [state]
+        code = nodes[state]
+        while code >> 2 > 0:
+            prev = blank - self._deltas[code & 3]
+            tile = (state >> (prev << 2)) & 15
+            state += (tile << (blank << 2)) - (tile << (prev << 2))
+            blank = prev
+            path.append(state)
+            code = nodes[state]
+
+        return path[::-1]
+
+    def _serialize_path(self, path):
+        """
+        Converts path of packed states into path of serialized states.
+
+        Arguments:
+            path (list): Packed states.
+
+        Returns:
+            path (list): Serialized states.
+        """
+
+        return [serialize(unpack(state, self._N)) for state in path]
 
     def solve(self, start_state):
+        """
+        Solving given puzzle.
+
+        If cache is set, solution is looked up there first and every new
+        solution (unless budget was exceeded) is added to it.
+
+        Arguments:
+            start_state (list or np.ndarray): Starting state.
+
+        Returns:
+            flag (Status): If puzzle is solved, unsolvable or budget was
+                exceeded.
+            n_iters (int): Number of iterations.
+            path (list): Serialized states, `None` if there is no path.
+        """
+
+        if self._cache is None:
+            return self._solve(start_state)
+
+        config, state = self.config_key(), pack(start_state)
+        blank = blank_index(state, self._N)
+
+        moves = self._cache.get(config, state, self._N)
+        if moves is not None:
+            self._start_search()
+            path = self._replay_path(state, blank, list(moves))
+            result = self._finish(Status.SOLVED, 0,
+                                  self._serialize_path(path), 0)
+            self._stats["cached"] = True
+
+            return result
+
+        flag, (n_iters, path) = self._solve(start_state)
+
+        if flag == Status.SOLVED and self._stats["reason"] is None and \
+                self._cacheable():
+            states = [pack(x) for x in path]
+            moves = bytes(blank_index(x, self._N) for x in states[1:])
+            self._cache.put(config, state, moves,
+                            states[:-1] if self.OPTIMAL else None)
+
+        return flag, (n_iters, path)
+
+    def _cacheable(self):
+        """Returns if the last solution can be cached under `config_key`."""
+        return True
+
+    def _solve(self, start_state):
         raise NotImplementedError  # each subclass needs to implement this
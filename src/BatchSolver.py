@@ -0,0 +1,104 @@
+import multiprocessing
+import time
+
+from .Solvers import Solvers
+
+# solver instances of the current worker process, one per puzzle size
+_worker_solvers = {}
+_worker_spec = None
+_worker_budget = None
+_worker_cache = None
+
+
+def _create_solver(solver_spec, N):
+    r"""
+    Creates solver from its specification.
+
+    Arguments:
+        solver_spec (int or tuple): Solver index (see `Solvers`) or pair of
+            solver index and dictionary of additional constructor arguments.
+        N (int): Puzzle size.
+    Returns:
+        solver (BaseSolver): Solver instance.
+    """
+
+    if isinstance(solver_spec, tuple):
+        idx, kwargs = solver_spec
+    else:
+        idx, kwargs = solver_spec, {}
+
+    return Solvers.get_solver_instance(idx)(N, **kwargs)
+
+
+def _init_worker(solver_spec, budget, cache):
+    global _worker_spec, _worker_budget, _worker_cache
+
+    _worker_spec, _worker_budget, _worker_cache = solver_spec, budget, cache
+    _worker_solvers.clear()
+
+
+def _solve_task(task):
+    r"""
+    Solves a single puzzle inside worker process.
+
+    Solvers (and their heuristic tables) are created once per worker and
+    puzzle size and reused by all following tasks.
+
+    Arguments:
+        task (tuple): Index of the puzzle and its starting state.
+    Returns:
+        result (dict): Index, flag, number of iterations, path, wall time
+            and reason why budget was exceeded.
+    """
+
+    idx, state = task
+    N = len(state)
+
+    if N not in _worker_solvers:
+        _worker_solvers[N] = _create_solver(_worker_spec, N)
+        _worker_solvers[N].set_budget(_worker_budget)
+        _worker_solvers[N].set_cache(_worker_cache)
+
+    solver = _worker_solvers[N]
+    start_time = time.time()
+    flag, (n_iters, path) = solver.solve(state)
+
+    return {
+        "idx": idx,
+        "flag": flag,
+        "n_iters": n_iters,
+        "path": path,
+        "time": time.time() - start_time,
+        "reason": solver.get_stats()["reason"],
+    }
+
+
+def solve_many(states, solver_spec, workers=None, chunksize=1, budget=None,
+               cache=None):
+    r"""
+    Solves many puzzles with a pool of processes.
+
+    Results are yielded as soon as each puzzle is solved, so they don't
+    come in the order of `states` (use `idx` of each result for that).
+
+    Arguments:
+        states (iterable): Starting states.
+        solver_spec (int or tuple): Solver index (see `Solvers`) or pair of
+            solver index and dictionary of additional constructor arguments.
+        workers (int): Number of processes, number of CPUs if `None`.
+        chunksize (int): Number of puzzles sent to a worker at once.
+        budget (Budget): Limits of each solver run, so a single hard puzzle
+            can't take the whole memory or block a worker forever.
+        cache (SolutionCache): Solution cache, each worker gets its own copy
+            so it should be backed by a database in order to be shared.
+    Returns:
+        iterable (generator): Dictionaries with index of the puzzle, flag,
+            number of iterations, path, wall time and reason why budget was
+            exceeded.
+    """
+
+    with multiprocessing.Pool(workers, initializer=_init_worker,
+                              initargs=(solver_spec, budget, cache)) as pool:
+        for result in pool.imap_unordered(_solve_task, enumerate(states),
+                                          chunksize):
+            yield result
@@ -0,0 +1,151 @@
+from .BaseSolver import BaseSolver, Status
+from .Budget import BudgetExceeded
+from .Heuristic import TargetManhattan
+from .OpenList import get_open_list
+from utils.utils import pack, blank_index, is_solvable
+
+
+class BiAstar(BaseSolver):
+    """
+    Bidirectional A* algorithm.
+
+    Forward search goes from the starting state towards the final state and
+    backward search from the final state towards the starting state (moves
+    are reversible, so both use the same neighbors). Searches meet in the
+    middle and the shortest path found through any common state is optimal
+    once it's not longer than the lowest f score of either open list.
+    """
+
+    def __init__(self, N, heuristic="manhattan", open_list="bucket",
+                 randomize=False):
+        """
+        Base constructor.
+
+        Given heuristics is used by the forward search, backward search uses
+        Manhattan distance to the starting state.
+
+        Arguments:
+            N (int): puzzle size.
+            heuristic (str or Heuristic): Heuristics (see `HEURISTICS`).
+            open_list (str): Open list (see `OPEN_LISTS`).
+            randomize (bool): If neighbors should be randomly shuffled.
+        """
+
+        super().__init__(N, heuristic=heuristic, randomize=randomize)
+
+        get_open_list(open_list)  # verifying that open list exists
+        self._open_list = open_list
+
+    def _solve(self, start_state):
+        """
+        Solving given puzzle.
+
+        Each iteration expands state from the direction with fewer open
+        states. Both heuristics have to be consistent. Nodes of both
+        directions are stored as `g << 2 | move` (see `_trace_path`), so the
+        path is traced from the meeting state towards both ends.
+
+        Arguments:
+            start_state (list or np.ndarray): Starting state.
+        Returns:
+            flag (Status): If puzzle is solved, unsolvable or budget was
+                exceeded.
+            n_iters (int): Number of iterations.
+        """
+
+        self._start_state = pack(start_state)
+        self._start_blank = blank_index(self._start_state, self._N)
+        n_iters = 0
+        next_check = self._start_search()
+
+        # trivial check if the given puzzle can be solved or not
+        if not is_solvable(self._start_state, self._N):
+            return self._finish(Status.UNSOLVABLE, n_iters, None, 0)
+
+        # open list, nodes and heuristics update of both directions
+        searches = []
+        for state, blank, heuristic in (
+                (self._start_state, self._start_blank, self._heuristic),
+                (self._end_state, 0,
+                 TargetManhattan(self._N, self._start_state))):
+            h, aux = heuristic.evaluate(state)
+            open_list = get_open_list(self._open_list)
+            open_list.push(h, 0, (state, blank, 0, h, aux))
+            searches.append((open_list, {state: 0}, heuristic.update))
+        forward, backward = searches
+
+        # length of the shortest path found so far and its meeting state
+        best, meet = float("inf"), None
+        if self._start_state == self._end_state:
+            best, meet = 0, self._end_state
+
+        move_index = self._move_index
+        while len(forward[0]) > 0 and len(backward[0]) > 0:
+            if best <= max(forward[0].min_f(), backward[0].min_f()):
+                break
+
+            if len(forward[0]) <= len(backward[0]):
+                (open_list, nodes, update_h), other_nodes = forward, \
+                    backward[1]
+            else:
+                (open_list, nodes, update_h), other_nodes = backward, \
+                    forward[1]
+
+            state, blank, g_val, h_val, aux = open_list.pop()
+
+            if g_val > nodes[state] >> 2:  # state was reached by shorter path
+                continue
+
+            n_iters += 1
+            if n_iters == next_check:
+                closed_size = len(forward[1]) + len(backward[1])
+                try:
+                    next_check = self._checkpoint(
+                        n_iters, g_val + h_val,
+                        len(forward[0]) + len(backward[0]), closed_size)
+                except BudgetExceeded as e:
+                    return self._finish(Status.BUDGET_EXCEEDED, n_iters,
+                                        None, closed_size, e.reason)
+
+            for next_state, next_blank, tile in self._get_neighbors(
+                    state, blank):
+                cur_dist = g_val + 1
+                code = nodes.get(next_state)
+
+                if code is None or cur_dist < code >> 2:  # relax
+                    nodes[next_state] = (cur_dist << 2) | \
+                        move_index[next_blank - blank]
+
+                    # state is reached by both searches
+                    other_code = other_nodes.get(next_state)
+                    if other_code is not None and \
+                            cur_dist + (other_code >> 2) < best:
+                        best, meet = cur_dist + (other_code >> 2), next_state
+
+                    next_h, next_aux = update_h(h_val, aux, next_state,
+                                                tile, next_blank, blank)
+                    open_list.push(cur_dist + next_h, cur_dist,
+                                   (next_state, next_blank, cur_dist,
+                                    next_h, next_aux))
+
+        closed_size = len(forward[1]) + len(backward[1])
+        if meet is None:
+            return self._finish(Status.UNSOLVABLE, n_iters, None, closed_size)
+
+        meet_blank = blank_index(meet, self._N)
+        path = self._trace_path(forward[1], meet, meet_blank) + \
+            self._trace_path(backward[1], meet, meet_blank)[-2::-1]
+
+        return self._finish(Status.SOLVED, n_iters,
+                            self._serialize_path(path), closed_size)
+
+
+if __name__ == "__main__":
+    starting_states = [
+        [[7, 1, 2], [0, 8, 3], [6, 4, 5]],
+        [[8, 5, 9, 11], [7, 12, 10, 4], [0, 15, 13, 14], [1, 2, 6, 3]],
+    ]
+
+    for state in starting_states:
+        solver = BiAstar(len(state))
+        print(solver.solve(state))
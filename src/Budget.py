@@ -0,0 +1,80 @@
+import time
+
+
+class BudgetExceeded(Exception):
+    """
+    Raised inside solver when any limit of its budget is exceeded.
+
+    Solvers catch it and return `Status.BUDGET_EXCEEDED` instead.
+    """
+
+    def __init__(self, reason):
+        super().__init__(reason)
+
+        self.reason = reason
+
+
+class Budget:
+    """
+    Limits of a single solver run.
+
+    Number of expansions, wall-clock time and size of closed set (states
+    kept in memory) can be limited, any limit that is `None` isn't checked.
+    Limits aren't checked on every expansion but every `check_interval`
+    expansions, so the check costs a single comparison in the hot loop.
+    """
+
+    def __init__(self, max_expansions=None, time_limit=None, max_closed=None,
+                 check_interval=1024):
+        """
+        Base constructor.
+
+        Arguments:
+            max_expansions (int): Maximum number of expanded states.
+            time_limit (float): Maximum duration of a run in seconds.
+            max_closed (int): Maximum number of states kept in memory.
+            check_interval (int): Number of expansions between two checks.
+        """
+
+        if check_interval < 1:
+            raise ValueError("Invalid check interval")
+
+        self._max_expansions = max_expansions
+        self._time_limit = time_limit
+        self._max_closed = max_closed
+        self._check_interval = check_interval
+        self._deadline = None
+
+    def start(self):
+        """Starts measuring time of a new run."""
+        if self._time_limit is not None:
+            self._deadline = time.time() + self._time_limit
+
+    def next_check(self, n_iters):
+        """Returns number of expansions of the next check."""
+        next_iters = n_iters + self._check_interval
+        if self._max_expansions is not None:
+            # checking exactly when the limit is reached
+            next_iters = min(next_iters,
+                             max(self._max_expansions, n_iters + 1))
+
+        return next_iters
+
+    def check(self, n_iters, closed_size):
+        """
+        Checks all limits.
+
+        BudgetExceeded will be raised if any limit is exceeded.
+
+        Arguments:
+            n_iters (int): Number of expanded states.
+            closed_size (int): Number of states kept in memory.
+        """
+
+        if self._max_expansions is not None and \
+                n_iters >= self._max_expansions:
+            raise BudgetExceeded("expansions")
+        if self._max_closed is not None and closed_size > self._max_closed:
+            raise BudgetExceeded("memory")
+        if self._deadline is not None and time.time() > self._deadline:
+            raise BudgetExceeded("time")
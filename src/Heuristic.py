@@ -0,0 +1,517 @@
+from collections import deque
+
+from utils.utils import manhattan_table, mirror_table, mirror_state
+from utils.pattern_database import TABLES_PATH, get_pattern_table, \
+    canonical_pattern
+
+# precomputed walking distance tables for each puzzle size
+_WD_TABLES = {}
+
+
+class Heuristic:
+    """
+    Base class for admissible heuristics used by A* variants.
+
+    Besides full evaluation, each heuristic supports incremental update from
+    the parent state. Heuristic may carry arbitrary auxiliary value `aux`
+    along with each state (e.g. partially computed keys) which is passed back
+    on every update.
+    """
+
+    name = None
+
+    def __init__(self, N):
+        """
+        Base constructor.
+
+        Arguments:
+            N (int): Puzzle size.
+        """
+
+        self._N = N
+        self._N2 = N * N
+
+    def evaluate(self, state):
+        """
+        Full evaluation of heuristics.
+
+        Arguments:
+            state (int): Packed state.
+
+        Returns:
+            h (int): Heuristic value.
+            aux (object): Auxiliary value for further updates.
+        """
+
+        raise NotImplementedError  # each subclass needs to implement this
+
+    def update(self, h, aux, state, tile, src, dst):
+        """
+        Incremental evaluation of heuristics.
+
+        Arguments:
+            h (int): Heuristic value of the parent state.
+            aux (object): Auxiliary value of the parent state.
+            state (int): Packed state obtained by the move.
+            tile (int): Moved tile.
+            src (int): Position of the tile in the parent state.
+            dst (int): Position of the tile in the given state.
+
+        Returns:
+            h (int): Heuristic value.
+            aux (object): Auxiliary value for further updates.
+        """
+
+        raise NotImplementedError  # each subclass needs to implement this
+
+    def __call__(self, state):
+        return self.evaluate(state)[0]
+
+
+class Manhattan(Heuristic):
+    """
+    Manhattan distance between given state and final state.
+
+    Blank tile isn't counted. Only the moved tile changes its distance so
+    update is done with a single table lookup.
+    """
+
+    name = "manhattan"
+
+    def __init__(self, N):
+        super().__init__(N)
+
+        self._md = manhattan_table(N)
+
+    def evaluate(self, state):
+        h = sum(self._md[(state >> (i << 2)) & 15][i]
+                for i in range(self._N2))
+
+        return h, None
+
+    def update(self, h, aux, state, tile, src, dst):
+        md = self._md[tile]
+
+        return h + md[dst] - md[src], None
+
+
+class TargetManhattan(Manhattan):
+    """
+    Manhattan distance between given state and arbitrary target state.
+
+    Used by backward searches which are directed towards the starting state.
+    It isn't one of `HEURISTICS` since it depends on the target state.
+    """
+
+    name = "target_manhattan"
+
+    def __init__(self, N, target):
+        """
+        Base constructor.
+
+        Arguments:
+            N (int): Puzzle size.
+            target (int): Packed target state.
+        """
+
+        super().__init__(N)
+
+        md = [[0] * self._N2 for _ in range(self._N2)]
+        for i in range(self._N2):
+            tile = (target >> (i << 2)) & 15
+            if tile != 0:
+                md[tile] = [abs(i % N - j % N) + abs(i // N - j // N)
+                            for j in range(self._N2)]
+        self._md = md
+
+
+class LinearConflict(Manhattan):
+    """
+    Manhattan distance with linear conflicts.
+
+    Two tiles are in linear conflict if they are in the same row (column),
+    both belong to that row (column) but are in the reversed order. For each
+    line, the minimum number of tiles that has to leave it in order to remove
+    all conflicts is found (line length minus longest increasing
+    subsequence) and each such tile adds 2 moves.
+
+    Vertical move changes only contents of two rows and horizontal move only
+    contents of two columns, so just these lines are re-evaluated. Values are
+    memoized per line contents.
+    """
+
+    name = "linear_conflict"
+
+    def __init__(self, N):
+        super().__init__(N)
+
+        self._line_mask = (1 << (N << 2)) - 1
+        self._row_cache = [dict() for _ in range(N)]
+        self._col_cache = [dict() for _ in range(N)]
+
+    def _line_conflict(self, tiles):
+        """
+        Calculates conflict cost of a single line.
+
+        Arguments:
+            tiles (list): Goal positions along the line of tiles belonging to
+                this line, in the current order.
+
+        Returns:
+            cost (int): Additional moves caused by conflicts.
+        """
+
+        # longest increasing subsequence, lines are short
+        lis = [1] * len(tiles)
+        for i in range(len(tiles)):
+            for j in range(i):
+                if tiles[j] < tiles[i] and lis[j] + 1 > lis[i]:
+                    lis[i] = lis[j] + 1
+
+        return 2 * (len(tiles) - max(lis, default=0))
+
+    def _row(self, state, r):
+        bits = (state >> (r * self._N << 2)) & self._line_mask
+        cache = self._row_cache[r]
+
+        if bits not in cache:
+            tiles = [(bits >> (c << 2)) & 15 for c in range(self._N)]
+            tiles = [x % self._N for x in tiles
+                     if x != 0 and x // self._N == r]
+            cache[bits] = self._line_conflict(tiles)
+
+        return cache[bits]
+
+    def _col(self, state, c):
+        bits = 0
+        for r in range(self._N):
+            tile = (state >> ((r * self._N + c) << 2)) & 15
+            bits |= tile << (r << 2)
+        cache = self._col_cache[c]
+
+        if bits not in cache:
+            tiles = [(bits >> (r << 2)) & 15 for r in range(self._N)]
+            tiles = [x // self._N for x in tiles
+                     if x != 0 and x % self._N == c]
+            cache[bits] = self._line_conflict(tiles)
+
+        return cache[bits]
+
+    def evaluate(self, state):
+        h, _ = super().evaluate(state)
+
+        for i in range(self._N):
+            h += self._row(state, i) + self._col(state, i)
+
+        return h, None
+
+    def update(self, h, aux, state, tile, src, dst):
+        md = self._md[tile]
+        h += md[dst] - md[src]
+
+        # parent state, tile is moved back to the blank
+        parent = state + (tile << (src << 2)) - (tile << (dst << 2))
+
+        src_r, src_c = divmod(src, self._N)
+        dst_r, dst_c = divmod(dst, self._N)
+        if src_c == dst_c:  # vertical move, order in columns is the same
+            h += self._row(state, src_r) + self._row(state, dst_r) - \
+                self._row(parent, src_r) - self._row(parent, dst_r)
+        else:  # horizontal move, order in rows is the same
+            h += self._col(state, src_c) + self._col(state, dst_c) - \
+                self._col(parent, src_c) - self._col(parent, dst_c)
+
+        return h, None
+
+
+def walking_distance_table(N):
+    r"""
+    Builds walking distance table for the given puzzle size.
+
+    Rows of a state are described by matrix where entry `(i, j)` is the number
+    of tiles in row `i` whose goal row is `j`, along with the row of the blank
+    tile. Matrix is packed into an integer (3 bits per entry) and the row of
+    the blank tile is stored above it. Breadth-first search from the final
+    state gives the minimum number of vertical moves for each such matrix.
+    Because final state is symmetric, the same table is used for columns.
+
+    Table is computed only once per puzzle size.
+
+    Arguments:
+        N (int): Puzzle size.
+    Returns:
+        table (dict): Walking distances indexed by packed matrices.
+    """
+
+    if N not in _WD_TABLES:
+        blank_shift = 3 * N * N
+
+        # blank tile belongs to the first row
+        goal = (N - 1) + sum(N << (3 * (i * N + i)) for i in range(1, N))
+
+        table = {goal: 0}
+        queue = deque([goal])
+        while len(queue) > 0:
+            key = queue.popleft()
+            b = key >> blank_shift
+
+            for nb in (b - 1, b + 1):
+                if nb < 0 or nb >= N:
+                    continue
+
+                # moving one tile from row `nb` to the row of blank tile
+                for g in range(N):
+                    if (key >> (3 * (nb * N + g))) & 7 == 0:
+                        continue
+
+                    next_key = key - (1 << (3 * (nb * N + g))) + \
+                        (1 << (3 * (b * N + g))) + ((nb - b) << blank_shift)
+                    if next_key not in table:
+                        table[next_key] = table[key] + 1
+                        queue.append(next_key)
+
+        _WD_TABLES[N] = table
+
+    return _WD_TABLES[N]
+
+
+class WalkingDistance(Heuristic):
+    """
+    Walking distance heuristics.
+
+    Sum of the minimum numbers of vertical and horizontal moves when tiles
+    within the same row (column) are treated as indistinguishable. Keys of
+    both matrices are carried as auxiliary value so each update only changes
+    a few bits of the key.
+    """
+
+    name = "walking_distance"
+
+    def __init__(self, N):
+        super().__init__(N)
+
+        self._table = walking_distance_table(N)
+        self._blank_shift = 3 * self._N2
+        self._key_shift = self._blank_shift + 3
+        self._key_mask = (1 << self._key_shift) - 1
+
+    def evaluate(self, state):
+        row_key, col_key = 0, 0
+        for i in range(self._N2):
+            x = (state >> (i << 2)) & 15
+            r, c = divmod(i, self._N)
+
+            if x == 0:
+                row_key += r << self._blank_shift
+                col_key += c << self._blank_shift
+            else:
+                row_key += 1 << (3 * (r * self._N + x // self._N))
+                col_key += 1 << (3 * (c * self._N + x % self._N))
+
+        aux = row_key | (col_key << self._key_shift)
+
+        return self._table[row_key] + self._table[col_key], aux
+
+    def update(self, h, aux, state, tile, src, dst):
+        src_r, src_c = divmod(src, self._N)
+        dst_r, dst_c = divmod(dst, self._N)
+
+        if src_c == dst_c:  # vertical move changes only rows
+            g = tile // self._N
+            aux += (1 << (3 * (dst_r * self._N + g))) - \
+                (1 << (3 * (src_r * self._N + g))) + \
+                ((src_r - dst_r) << self._blank_shift)
+        else:  # horizontal move changes only columns
+            g = tile % self._N
+            aux += ((1 << (3 * (dst_c * self._N + g))) -
+                    (1 << (3 * (src_c * self._N + g))) +
+                    ((src_c - dst_c) << self._blank_shift)) << self._key_shift
+
+        h = self._table[aux & self._key_mask] + \
+            self._table[aux >> self._key_shift]
+
+        return h, aux
+
+
+class PatternDatabase(Heuristic):
+    """
+    Disjoint additive pattern databases.
+
+    Tiles are split into disjoint patterns and for each pattern table with
+    the minimum number of moves of its tiles is looked up (see
+    `utils.pattern_database`). Tables are built only once, saved to disk and
+    afterwards loaded as memory-mapped files.
+
+    Indices of all patterns are packed together into the auxiliary value.
+    Moving a tile changes only index of its pattern, so update is done with
+    two table lookups. Mirror patterns share the same table (see
+    `canonical_pattern`), positions of their tiles are reflected instead.
+    """
+
+    name = "pdb"
+
+    # default partitions of tiles for each puzzle size, closed under mirror
+    PARTITIONS = {
+        3: ((1, 2, 5), (3, 6, 7), (4, 8)),
+        4: ((1, 2, 3, 6, 7), (4, 8, 9, 12, 13), (5, 10, 11, 14, 15)),
+    }
+
+    def __init__(self, N, partition=None, path=TABLES_PATH):
+        """
+        Base constructor.
+
+        Arguments:
+            N (int): Puzzle size.
+            partition (tuple): Disjoint patterns, default one is used if
+                `None` is given.
+            path (str): Directory of pattern tables.
+        """
+
+        super().__init__(N)
+
+        self._partition = partition or self.PARTITIONS[N]
+        self._path = path
+
+        # pattern, weight, bit offset of index and map of positions for
+        # each tile
+        identity, mirror = list(range(self._N2)), mirror_table(N)
+        self._tiles = [None] * self._N2
+        self._masks, self._table_patterns, shift = [], [], 0
+        for p, pattern in enumerate(self._partition):
+            table_pattern, mirrored = canonical_pattern(pattern, N)
+            self._table_patterns.append(table_pattern)
+
+            positions = mirror if mirrored else identity
+            for slot, tile in enumerate(table_pattern):
+                if mirrored:
+                    tile = mirror[tile]
+                self._tiles[tile] = (p, self._N2 ** slot, shift, positions)
+
+            width = (self._N2 ** len(pattern) - 1).bit_length()
+            self._masks.append(((1 << width) - 1, shift))
+            shift += width
+
+        self._load_tables()
+
+    def _load_tables(self):
+        tables = {}
+        for pattern in self._table_patterns:
+            if pattern not in tables:
+                tables[pattern] = get_pattern_table(self._N, pattern,
+                                                    self._path)
+
+        self._tables = [tables[pattern] for pattern in self._table_patterns]
+
+    def __getstate__(self):
+        # memory-mapped tables are loaded again in the other process
+        state = self.__dict__.copy()
+        del state["_tables"]
+
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._load_tables()
+
+    def evaluate(self, state):
+        aux = 0
+        for i in range(self._N2):
+            tile = (state >> (i << 2)) & 15
+            if tile != 0 and self._tiles[tile] is not None:
+                _, weight, shift, positions = self._tiles[tile]
+                aux += (positions[i] * weight) << shift
+
+        h = 0
+        for table, (mask, shift) in zip(self._tables, self._masks):
+            h += table[(aux >> shift) & mask]
+
+        return h, aux
+
+    def update(self, h, aux, state, tile, src, dst):
+        if self._tiles[tile] is None:
+            return h, aux
+
+        p, weight, shift, positions = self._tiles[tile]
+        mask = self._masks[p][0]
+        table = self._tables[p]
+
+        h -= table[(aux >> shift) & mask]
+        aux += ((positions[dst] - positions[src]) * weight) << shift
+        h += table[(aux >> shift) & mask]
+
+        return h, aux
+
+
+class MirrorPatternDatabase(PatternDatabase):
+    """
+    Maximum of disjoint pattern databases of state and its mirror.
+
+    State and its mirror (see `utils.utils.mirror_state`) have the same
+    distance, so both lookups are admissible. Partitions are chosen so that
+    the mirror of a pattern isn't in the partition, otherwise both lookups
+    would be equal. Auxiliary value holds both lookups and the mirror state,
+    which is updated with the mirrored move.
+    """
+
+    name = "pdb_mirror"
+
+    PARTITIONS = {
+        3: ((1, 2, 3, 4), (5, 6, 7, 8)),
+        4: ((1, 2, 3, 4, 5), (6, 7, 8, 9, 10), (11, 12, 13, 14, 15)),
+    }
+
+    def __init__(self, N, partition=None, path=TABLES_PATH):
+        super().__init__(N, partition, path)
+
+        self._mirror = mirror_table(N)
+
+    def evaluate(self, state):
+        mirrored = mirror_state(state, self._N)
+        h, aux = super().evaluate(state)
+        mirror_h, mirror_aux = super().evaluate(mirrored)
+
+        return max(h, mirror_h), (h, aux, mirror_h, mirror_aux, mirrored)
+
+    def update(self, h, aux, state, tile, src, dst):
+        h, aux, mirror_h, mirror_aux, mirrored = aux
+        h, aux = super().update(h, aux, state, tile, src, dst)
+
+        m = self._mirror
+        tile, src, dst = m[tile], m[src], m[dst]
+        mirrored += (tile << (dst << 2)) - (tile << (src << 2))
+        mirror_h, mirror_aux = super().update(mirror_h, mirror_aux, mirrored,
+                                              tile, src, dst)
+
+        return max(h, mirror_h), (h, aux, mirror_h, mirror_aux, mirrored)
+
+
+# all available heuristics
+HEURISTICS = {
+    Manhattan.name: Manhattan,
+    LinearConflict.name: LinearConflict,
+    WalkingDistance.name: WalkingDistance,
+    PatternDatabase.name: PatternDatabase,
+    MirrorPatternDatabase.name: MirrorPatternDatabase,
+}
+
+
+def get_heuristic(heuristic, N):
+    r"""
+    Returns heuristics instance.
+
+    If `heuristic` isn't instance of `Heuristic` or one of the names in
+    `HEURISTICS` ValueError will be raised.
+
+    Arguments:
+        heuristic (str or Heuristic): Name of heuristics or its instance.
+        N (int): Puzzle size.
+    Returns:
+        heuristic (Heuristic): Heuristics instance.
+    """
+
+    if isinstance(heuristic, Heuristic):
+        return heuristic
+    if heuristic not in HEURISTICS:
+        raise ValueError("Invalid heuristic")
+
+    return HEURISTICS[heuristic](N)
@@ -1,98 +1,134 @@
-import heapq
+from .BaseSolver import BaseSolver, Status
+from .Budget import BudgetExceeded
+from utils.utils import pack, blank_index, is_solvable
 
-from .BaseSolver import BaseSolver
-from utils.utils import reconstruct_path, serialize, is_solvable, h
+FOUND = -1  # returned by search when final state is reached
 
 
 class IDAstar(BaseSolver):
     """
     Iterative deepening A*.
 
-    States will be explored in case their f score isn't greater than the given
-    threshold. Threshold will be properly updated in order to reach the final
-    state.
+    States will be explored depth-first in case their f score isn't greater
+    than the given threshold. Threshold will be properly updated in order to
+    reach the final state. Only the current path is kept in memory, so memory
+    is linear in depth of the solution.
     """
 
-    def __init__(self, N):
+    def __init__(self, N, heuristic="manhattan", randomize=False):
         """
         Base constructor.
 
         Arguments:
             N (int): puzzle size.
+            heuristic (str or Heuristic): Heuristics (see `HEURISTICS`).
+            randomize (bool): If neighbors should be randomly shuffled.
         """
 
-        super().__init__(N)
+        super().__init__(N, heuristic=heuristic, randomize=randomize)
 
-    def _solve_threshold(self, start_state, threshold):
-        n_iters, next_threshold = 0, float("inf")
+    def _search(self, state, blank, prev, g, h, aux, threshold):
+        """
+        Depth-first search bounded by threshold.
+
+        Positions of blank tile along the current path are kept on
+        `self._path` stack. Moves are made by passing the next state to the
+        recursive call and unmade by popping the stack. Move that returns the
+        blank tile to its previous position is never made.
 
-        # initializing dictionaries for distances and parents
-        dist, parent = {}, {}
-        dist[self._start_state], parent[self._start_state] = 0, None
+        Arguments:
+            state (int): Current packed state.
+            blank (int): Position of blank tile in the current state.
+            prev (int): Position of blank tile in the parent state.
+            g (int): Distance from the starting state.
+            h (int): Heuristic value of the current state.
+            aux (object): Auxiliary value of heuristics.
+            threshold (int): Maximum f score that will be explored.
 
-        min_heap = []  # this list is used as Min-Heap
-        heapq.heappush(min_heap, (h(self._start_state), self._start_state))
+        Returns:
+            f (int): `FOUND` if final state is reached, otherwise the minimum
+                f score that exceeded the threshold.
+        """
 
-        while len(min_heap) > 0:
-            _, state = heapq.heappop(min_heap)
+        f = g + h
+        if f > threshold:
+            return f
+        if state == self._end_state:
+            return FOUND
 
-            if state == self._end_state:
-                path = reconstruct_path(parent, state)
+        self._n_iters += 1
+        if self._n_iters == self._next_check:
+            self._next_check = self._checkpoint(
+                self._n_iters, threshold, len(self._path), len(self._path))
 
-                return True, (n_iters, None, path)
-            else:
-                n_iters += 1
+        next_threshold = float("inf")
 
-                for next_state, w in self._get_neighbors(state):
-                    cur_dist = dist[state] + w
+        for next_state, next_blank, tile in self._get_neighbors(state, blank):
+            if next_blank == prev:  # parent-move pruning
+                continue
 
-                    if cur_dist < dist.get(next_state, float("inf")):  # relax
-                        dist[next_state] = cur_dist
-                        parent[next_state] = state
-                        cost_guess = cur_dist + h(next_state)
+            next_h, next_aux = self._update_h(h, aux, next_state, tile,
+                                              next_blank, blank)
 
-                        if cost_guess <= threshold:
-                            heapq.heappush(min_heap, (cost_guess, next_state))
-                        else:
-                            next_threshold = min(next_threshold, cost_guess)
+            self._path.append(next_blank)  # make move
+            t = self._search(next_state, next_blank, blank, g + 1,
+                             next_h, next_aux, threshold)
+            if t == FOUND:
+                return FOUND
+            self._path.pop()  # unmake move
 
-        return False, (n_iters, next_threshold, None)
+            next_threshold = min(next_threshold, t)
 
-    def solve(self, start_state):
+        return next_threshold
+
+    def _solve(self, start_state):
         """
         Solving given puzzle.
 
-        This implementation assumes that given heurstics is consistent meaning
-        that it's sufficient to relax distance the moment it becomes possible
-        and such action will never be possible in the future. Manhattan
-        distance is used.
+        Since the whole path is explored depth-first there are no dictionaries
+        of distances and parents, so memory usage is O(depth). Manhattan
+        distance is used by default.
 
         Arguments:
             start_state (list or np.ndarray): Starting state.
 
         Returns:
-            flag (bool): If puzzle is solvable.
+            flag (Status): If puzzle is solved, unsolvable or budget was
+                exceeded.
             n_iters (int): Number of iterations.
 
         """
 
-        self._start_state = serialize(start_state)
-        n_iters, threshold = 0, 0
+        self._start_state = pack(start_state)
+        self._start_blank = blank_index(self._start_state, self._N)
+        self._n_iters = 0
+        self._next_check = self._start_search()
 
         # trivial check if the given puzzle can be solved or not
-        if not is_solvable(self._start_state):
-            return False, (n_iters, None)
-
-        flag, (threshold_iters, next_threshold, path) = \
-            self._solve_threshold(start_state, threshold)
-        while not flag:
-            threshold = next_threshold
-            n_iters += threshold_iters
-
-            flag, (threshold_iters, next_threshold, path) = \
-                self._solve_threshold(start_state, threshold)
-
-        return True, (n_iters + threshold_iters, path)
+        if not is_solvable(self._start_state, self._N):
+            return self._finish(Status.UNSOLVABLE, self._n_iters, None, 0)
+
+        self._update_h = self._heuristic.update
+        start_h, start_aux = self._h(self._start_state)
+
+        threshold = start_h
+        while True:
+            self._path = []
+            try:
+                threshold = self._search(self._start_state, self._start_blank,
+                                         None, 0, start_h, start_aux,
+                                         threshold)
+            except BudgetExceeded as e:
+                return self._finish(Status.BUDGET_EXCEEDED, self._n_iters,
+                                    None, len(self._path), e.reason)
+
+            if threshold == FOUND:
+                path = self._replay_path(self._start_state, self._start_blank,
+                                         self._path)
+
+                return self._finish(Status.SOLVED, self._n_iters,
+                                    self._serialize_path(path),
+                                    len(self._path))
 
 
 if __name__ == "__main__":
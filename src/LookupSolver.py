@@ -0,0 +1,118 @@
+from .BaseSolver import BaseSolver, Status
+from utils.utils import pack, blank_index, is_solvable
+from utils.pattern_database import TABLES_PATH
+from utils.lookup_table import get_lookup_table, state_rank, DIST_MASK, \
+    MOVE_SHIFT
+
+
+class LookupSolver(BaseSolver):
+    """
+    Solver based on complete lookup table.
+
+    All solvable 3x3 states are stored in a table (see
+    `utils.lookup_table`) with their optimal distance and the next move, so
+    the optimal path is found with a single lookup per move. It can also be
+    used as an oracle for validating other solvers.
+    """
+
+    def __init__(self, N, path=TABLES_PATH):
+        """
+        Base constructor.
+
+        Lookup table is available only for 3x3 puzzles, otherwise ValueError
+        will be raised. Table is built the first time it's needed.
+
+        Arguments:
+            N (int): puzzle size.
+            path (str): Directory of lookup tables.
+        """
+
+        if N != 3:
+            raise ValueError("Lookup table is available only for 3x3 puzzles")
+
+        super().__init__(N)
+
+        self._table = get_lookup_table(N, path)
+        self._path = path
+
+    def __getstate__(self):
+        # memory-mapped table is loaded again in the other process
+        state = self.__dict__.copy()
+        del state["_table"]
+
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._table = get_lookup_table(self._N, self._path)
+
+    def distance(self, start_state):
+        """
+        Returns optimal distance to the final state.
+
+        Arguments:
+            start_state (list or np.ndarray): Starting state.
+
+        Returns:
+            dist (int): Optimal distance, `None` if puzzle isn't solvable.
+        """
+
+        state = pack(start_state)
+        if not is_solvable(state, self._N):
+            return None
+
+        return self._table[state_rank(state, self._N)] & DIST_MASK
+
+    def _solve(self, start_state):
+        """
+        Solving given puzzle.
+
+        Each iteration is a single table lookup that gives the move leading
+        one step closer to the final state, so the returned path is optimal.
+
+        Arguments:
+            start_state (list or np.ndarray): Starting state.
+
+        Returns:
+            flag (Status): If puzzle is solved or unsolvable.
+            n_iters (int): Number of iterations.
+
+        """
+
+        self._start_state = pack(start_state)
+        self._start_blank = blank_index(self._start_state, self._N)
+        n_iters = 0
+        self._start_search()  # path is at most 31 moves, budget isn't needed
+
+        # trivial check if the given puzzle can be solved or not
+        if not is_solvable(self._start_state, self._N):
+            return self._finish(Status.UNSOLVABLE, n_iters, None, 0)
+
+        state, blank, blanks = self._start_state, self._start_blank, []
+        entry = self._table[state_rank(state, self._N)]
+
+        while entry & DIST_MASK > 0:
+            n_iters += 1
+
+            target = blank + self._deltas[entry >> MOVE_SHIFT]
+            tile = (state >> (target << 2)) & 15
+            state += (tile << (blank << 2)) - (tile << (target << 2))
+            blank = target
+            blanks.append(blank)
+
+            entry = self._table[state_rank(state, self._N)]
+
+        path = self._replay_path(self._start_state, self._start_blank, blanks)
+
+        return self._finish(Status.SOLVED, n_iters,
+                            self._serialize_path(path), 0)
+
+
+if __name__ == "__main__":
+    starting_states = [
+        [[7, 1, 2], [0, 8, 3], [6, 4, 5]],
+    ]
+
+    for state in starting_states:
+        solver = LookupSolver(len(state))
+        print(solver.solve(state))
@@ -0,0 +1,129 @@
+import heapq
+
+
+class HeapOpenList:
+    """
+    Open list based on binary heap.
+
+    Works with any comparable f scores, including non-integer ones. Ties are
+    broken in favour of higher g score.
+    """
+
+    name = "heap"
+
+    def __init__(self):
+        """Base constructor."""
+        self._heap = []  # this list is used as Min-Heap
+
+    def push(self, f, g, item):
+        """
+        Adds item to the open list.
+
+        Arguments:
+            f (number): Priority of the item, lower is better.
+            g (int): Distance from the starting state, used for tie-breaking.
+            item (tuple): Item, usually state along with its data.
+        """
+
+        heapq.heappush(self._heap, (f, -g, item))
+
+    def pop(self):
+        """Removes and returns the item with the lowest priority."""
+        return heapq.heappop(self._heap)[2]
+
+    def min_f(self):
+        """Returns the lowest priority, open list must not be empty."""
+        return self._heap[0][0]
+
+    def __len__(self):
+        return len(self._heap)
+
+
+class BucketOpenList:
+    """
+    Open list based on buckets indexed by integer f scores.
+
+    Each bucket is a list of LIFO stacks indexed by g score. Items are popped
+    from the lowest non-empty f bucket and within it from the highest g
+    stack, so both push and pop are O(1) amortized. Only non-negative integer
+    f scores are supported.
+    """
+
+    name = "bucket"
+
+    def __init__(self):
+        """Base constructor."""
+        self._buckets = []
+        self._min_f = 0
+        self._size = 0
+
+    def push(self, f, g, item):
+        """
+        Adds item to the open list.
+
+        Arguments:
+            f (int): Priority of the item, lower is better.
+            g (int): Distance from the starting state, used for tie-breaking.
+            item (tuple): Item, usually state along with its data.
+        """
+
+        while len(self._buckets) <= f:
+            self._buckets.append([])
+        bucket = self._buckets[f]
+        while len(bucket) <= g:
+            bucket.append([])
+
+        bucket[g].append(item)
+        self._size += 1
+
+        if f < self._min_f:
+            self._min_f = f
+
+    def pop(self):
+        """Removes and returns the item with the lowest priority."""
+        bucket = self._buckets[self.min_f()]
+        self._size -= 1
+
+        return bucket[-1].pop()
+
+    def min_f(self):
+        """Returns the lowest priority, open list must not be empty."""
+        while True:
+            bucket = self._buckets[self._min_f]
+
+            # dropping empty stacks with the highest g
+            while len(bucket) > 0 and len(bucket[-1]) == 0:
+                bucket.pop()
+
+            if len(bucket) > 0:
+                return self._min_f
+            self._min_f += 1
+
+    def __len__(self):
+        return self._size
+
+
+# all available open lists
+OPEN_LISTS = {
+    HeapOpenList.name: HeapOpenList,
+    BucketOpenList.name: BucketOpenList,
+}
+
+
+def get_open_list(open_list):
+    r"""
+    Returns new open list.
+
+    If `open_list` isn't one of the names in `OPEN_LISTS` ValueError will be
+    raised.
+
+    Arguments:
+        open_list (str): Name of open list.
+    Returns:
+        open_list (HeapOpenList or BucketOpenList): Empty open list.
+    """
+
+    if open_list not in OPEN_LISTS:
+        raise ValueError("Invalid open list")
+
+    return OPEN_LISTS[open_list]()
@@ -0,0 +1,243 @@
+import multiprocessing
+
+from .BaseSolver import Status
+from .Budget import BudgetExceeded
+from .IDAstar import IDAstar, FOUND
+from utils.utils import pack, blank_index, is_solvable
+
+# solver of the current worker process
+_worker_solver = None
+
+
+def _init_worker(solver):
+    global _worker_solver
+
+    _worker_solver = solver
+
+
+def _search_unit(unit):
+    r"""
+    Searches subtree of a single work unit inside worker process.
+
+    Arguments:
+        unit (tuple): Node of the split tree (state, blank, previous blank,
+            g, h, aux), positions of blank tile on the path to it and
+            threshold.
+    Returns:
+        t (int): `FOUND` or the minimum f score that exceeded threshold.
+        blanks (list): Positions of blank tile along the solution path from
+            the starting state, `None` if it isn't found.
+        n_iters (int): Number of iterations.
+    """
+
+    node, blanks, threshold = unit
+    solver = _worker_solver
+
+    # progress and budget are handled by the main process
+    solver._n_iters, solver._next_check = 0, -1
+    solver._path = list(blanks)
+    t = solver._search(*node, threshold)
+
+    return t, solver._path if t == FOUND else None, solver._n_iters
+
+
+class ParallelIDAstar(IDAstar):
+    """
+    Iterative deepening A* running on multiple processes.
+
+    In each threshold iteration search tree is split at a shallow depth and
+    each node at that depth is a work unit, searched depth-first by a pool
+    of processes. Pool is terminated as soon as any unit reaches the final
+    state. All units share the same threshold, so the solution is still
+    optimal.
+
+    Daemonic processes can't have children, so inside them (e.g. in
+    `solve_many` workers or in the race in `main.py`) the search falls back
+    to serial IDA*.
+    """
+
+    def __init__(self, N, heuristic="manhattan", randomize=False,
+                 workers=None, split_depth=6):
+        """
+        Base constructor.
+
+        Arguments:
+            N (int): puzzle size.
+            heuristic (str or Heuristic): Heuristics (see `HEURISTICS`).
+            randomize (bool): If neighbors should be randomly shuffled.
+            workers (int): Number of processes, number of CPUs if `None`.
+            split_depth (int): Depth of work units, there are roughly
+                `2 ** split_depth` of them.
+        """
+
+        super().__init__(N, heuristic=heuristic, randomize=randomize)
+
+        self._workers = workers
+        self._split_depth = split_depth
+
+    def __getstate__(self):
+        # progress callback may not be picklable and isn't used by workers
+        state = self.__dict__.copy()
+        state["_progress"] = None
+
+        return state
+
+    def _split(self, state, blank, prev, g, h, aux, threshold, units):
+        """
+        Depth-first search that collects work units.
+
+        Arguments:
+            state (int): Current packed state.
+            blank (int): Position of blank tile in the current state.
+            prev (int): Position of blank tile in the parent state.
+            g (int): Distance from the starting state.
+            h (int): Heuristic value of the current state.
+            aux (object): Auxiliary value of heuristics.
+            threshold (int): Maximum f score that will be explored.
+            units (list): Collected work units.
+
+        Returns:
+            f (int): `FOUND` if final state is reached, otherwise the minimum
+                f score that exceeded the threshold above split depth.
+        """
+
+        f = g + h
+        if f > threshold:
+            return f
+        if state == self._end_state:
+            return FOUND
+        if g == self._split_depth:
+            units.append(((state, blank, prev, g, h, aux), list(self._path),
+                          threshold))
+            return float("inf")
+
+        self._n_iters += 1
+        next_threshold = float("inf")
+
+        for next_state, next_blank, tile in self._get_neighbors(state, blank):
+            if next_blank == prev:  # parent-move pruning
+                continue
+
+            next_h, next_aux = self._update_h(h, aux, next_state, tile,
+                                              next_blank, blank)
+
+            self._path.append(next_blank)  # make move
+            t = self._split(next_state, next_blank, blank, g + 1,
+                            next_h, next_aux, threshold, units)
+            if t == FOUND:
+                return FOUND
+            self._path.pop()  # unmake move
+
+            next_threshold = min(next_threshold, t)
+
+        return next_threshold
+
+    def _search_units(self, pool, units, threshold):
+        """
+        Searches work units with the pool of processes.
+
+        Arguments:
+            pool (Pool): Pool of processes shared by all thresholds.
+            units (list): Work units of the current threshold.
+            threshold (int): Current threshold.
+
+        Returns:
+            t (int): `FOUND` or the minimum f score that exceeded threshold.
+        """
+
+        next_threshold = float("inf")
+
+        for t, blanks, n_iters in pool.imap_unordered(_search_unit, units):
+            self._n_iters += n_iters
+            if 0 <= self._next_check <= self._n_iters:
+                self._next_check = self._checkpoint(
+                    self._n_iters, threshold, len(units), 0)
+
+            if t == FOUND:
+                self._path = blanks
+                return FOUND
+
+            next_threshold = min(next_threshold, t)
+
+        return next_threshold
+
+    def _solve(self, start_state):
+        """
+        Solving given puzzle.
+
+        Pool of processes is started once and reused by all thresholds, so
+        solver and its heuristics are sent to workers only once. Inside a
+        daemonic process the puzzle is solved by serial IDA*.
+
+        Arguments:
+            start_state (list or np.ndarray): Starting state.
+
+        Returns:
+            flag (Status): If puzzle is solved, unsolvable or budget was
+                exceeded.
+            n_iters (int): Number of iterations.
+
+        """
+
+        if multiprocessing.current_process().daemon:
+            return super()._solve(start_state)
+
+        self._start_state = pack(start_state)
+        self._start_blank = blank_index(self._start_state, self._N)
+        self._n_iters = 0
+        self._next_check = self._start_search()
+
+        # trivial check if the given puzzle can be solved or not
+        if not is_solvable(self._start_state, self._N):
+            return self._finish(Status.UNSOLVABLE, self._n_iters, None, 0)
+
+        self._update_h = self._heuristic.update
+        start_h, start_aux = self._h(self._start_state)
+
+        pool = None
+        try:
+            threshold = start_h
+            while True:
+                self._path, units = [], []
+                t = self._split(self._start_state, self._start_blank, None,
+                                0, start_h, start_aux, threshold, units)
+
+                if t != FOUND and len(units) > 0:
+                    if pool is None:
+                        pool = multiprocessing.Pool(
+                            self._workers, initializer=_init_worker,
+                            initargs=(self,))
+
+                    try:
+                        t = min(t, self._search_units(pool, units,
+                                                      threshold))
+                    except BudgetExceeded as e:
+                        return self._finish(Status.BUDGET_EXCEEDED,
+                                            self._n_iters, None, len(units),
+                                            e.reason)
+
+                if t == FOUND:
+                    path = self._replay_path(self._start_state,
+                                             self._start_blank, self._path)
+
+                    return self._finish(Status.SOLVED, self._n_iters,
+                                        self._serialize_path(path),
+                                        len(self._path))
+
+                threshold = t
+        finally:
+            # workers that are still searching aren't needed anymore
+            if pool is not None:
+                pool.terminate()
+                pool.join()
+
+
+if __name__ == "__main__":
+    starting_states = [
+        [[7, 1, 2], [0, 8, 3], [6, 4, 5]],
+        [[8, 5, 9, 11], [7, 12, 10, 4], [0, 15, 13, 14], [1, 2, 6, 3]],
+    ]
+
+    for state in starting_states:
+        solver = ParallelIDAstar(len(state))
+        print(solver.solve(state))
@@ -5,13 +5,15 @@ class Puzzle:
 
     def __init__(self, list_of_states, x, y, size):
         """
+        States are parsed only once: the first one into fields and all others
+        into positions of empty (zero) field after each move.
+
         Arguments:
             list_of_states (list): List of all puzzle states.
             x, y (int): Upper left point of puzzle.
             size (int): Size of puzzle in pixels.
         """
 
-        self._list_of_states = list_of_states
         self._x, self._y = x, y
         self._size = size  # size of puzzle. Can be 4,3 or 2
         self._n = size * size  # number of fields. Can be 16,9 or 4
@@ -20,34 +22,32 @@ class Puzzle:
 
         self._current_state_index = 0
         self._number_of_states = len(list_of_states)
-        self._fields = self.initialize_fields()
+        self._coords_list = self.get_all_coordinates()
+        self._fields = self.initialize_fields(
+            [int(value) for value in list_of_states[0].split(":")])
 
-    def current_puzzle_state(self):
-        tmp_state = self._list_of_states[self._current_state_index]
-        only_num = tmp_state.split(":")
+        # position of empty field in each state
+        self._blanks = bytes(state.split(":").index("0")
+                             for state in list_of_states)
 
-        tmp_state_list = []
-        for i in range(self._n):
-            tmp_state_list.append(int(only_num[i]))
+    def current_puzzle_state(self):
+        return [field._value for field in self._fields]
 
-        return tmp_state_list
+    def next_move(self):
+        """
+        Returns positions of empty (zero) field and the field that is
+        exchanged with it in the next move, `None` if there are no further
+        moves.
+        """
 
-    def next_puzzle_state(self):
         if self.is_last_state():
             return None
 
-        next_state = self._list_of_states[self._current_state_index + 1]
-        only_num = next_state.split(":")
-
-        next_state_list = []
-        for i in range(self._n):
-            next_state_list.append(int(only_num[i]))
-
-        return next_state_list
+        return (self._blanks[self._current_state_index],
+                self._blanks[self._current_state_index + 1])
 
     def is_last_state(self):
-        if(self._current_state_index == self._number_of_states - 1):
-            return True
+        return self._current_state_index == self._number_of_states - 1
 
     def get_field_size(self):
         return self._field_size
@@ -79,7 +79,7 @@ class Puzzle:
 
         return coords_list
 
-    def initialize_fields(self):
+    def initialize_fields(self, state):
         """
         Schedule of fields in puzzle:
 
@@ -92,57 +92,34 @@ class Puzzle:
                     => It doesn't mean that field has value equals to number 3!
 
         Field with value 0 is the field that is moving all the time.
-        """
 
-        tmp_state = self.current_puzzle_state()
-        coords_list = self.get_all_coordinates()
+        Arguments:
+            state (list): Values of fields.
+        """
 
         fields = []
         for i in range(0, self._n):
-            tmp_x, tmp_y = coords_list[i]
-            tmp_val = tmp_state[i]
+            tmp_x, tmp_y = self._coords_list[i]
+            tmp_val = state[i]
 
             fields.append(Field(tmp_x, tmp_y, tmp_val))
 
         return fields
 
-    def states_difference(self, current_st, next_st):
-        """
-        Calculates difference between two states.
-
-        Arguments:
-            current_st (int): Current state index.
-            next_st (int): Next state index.
-        """
-
-        for i in range(self._n):
-            if current_st[i] != next_st[i]:
-                # first changed field(index1, new_val1)
-                index1 = i
-                new_val1 = next_st[i]
-
-                # second changed field(index2, new_val2)
-                for j in range(i + 1, self._n):
-                    if current_st[j] != next_st[j]:
-                        index2 = j
-                        new_val2 = next_st[j]
-                        break
-                break
-
-        # Function returns variables in this order because of function
-        # solve_puzzle in the file where we draw puzzle
-        return index2, new_val1, index1, new_val2
-
     def states_change(self):
-        r"""Function only changes values of two fields."""
+        r"""Function swaps empty field and the field exchanged with it."""
         if self.is_last_state():
             return None
         else:
-            index1, new_val1, index2, new_val2 = self.states_difference(
-                self.current_puzzle_state(),
-                self.next_puzzle_state())
+            zero_index, exchange_index = self.next_move()
+            zero_field = self._fields[zero_index]
+            exchange_field = self._fields[exchange_index]
+
+            # fields take coordinates of their new positions
+            zero_field._x, zero_field._y = self._coords_list[exchange_index]
+            exchange_field._x, exchange_field._y = \
+                self._coords_list[zero_index]
+            self._fields[zero_index] = exchange_field
+            self._fields[exchange_index] = zero_field
 
             self._current_state_index += 1
-            self._fields[index1].change_value(new_val1)
-            self._fields[index2].change_value(new_val2)
-            self._fields = self.initialize_fields()
@@ -0,0 +1,131 @@
+import os
+import pygame
+
+from .Puzzle import Puzzle
+
+# same look as the main scene
+IMAGES_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                           "images")
+FONT_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                         "fonts", "calibri.ttf")
+FONT_COLOR = (31, 33, 43)
+FONT_SIZE = 24
+BACKGROUND_COLOR = (255, 255, 255)
+FIELD_SIZE = 100
+
+
+class Renderer:
+    """
+    Renders solutions to frames without a window.
+
+    Frames are drawn on an off-screen surface at a fixed frame rate, so the
+    output doesn't depend on the speed of the machine. Pygame has to be
+    usable without a display, e.g. with `SDL_VIDEODRIVER=dummy`.
+    """
+
+    def __init__(self, N, fps=30, move_time=200):
+        """
+        Base constructor.
+
+        Arguments:
+            N (int): Puzzle size.
+            fps (int): Number of frames per second.
+            move_time (int): Duration of a single move in milliseconds.
+        """
+
+        if fps < 1 or move_time < 0:
+            raise ValueError("Invalid frame rate or move time")
+
+        self._N = N
+        self._frames_per_move = max(1, fps * move_time // 1000)
+
+        pygame.init()
+        self._font = pygame.font.Font(FONT_PATH, FONT_SIZE)
+        self._sprites = dict()
+        for value in range(1, N * N):
+            path = os.path.join(IMAGES_PATH, str(value) + ".png")
+            self._sprites[value] = pygame.image.load(path)
+
+    def _draw_puzzle(self, surface, puzzle, label):
+        """Draws all fields of the puzzle and label under it."""
+        surface.fill(BACKGROUND_COLOR)
+        for field in puzzle._fields:
+            if field._value != 0:
+                surface.blit(self._sprites[field._value],
+                             (field._x, field._y))
+
+        if label is not None:
+            text = self._font.render(label, True, FONT_COLOR,
+                                     BACKGROUND_COLOR)
+            textrect = text.get_rect()
+            textrect.center = (self._N * FIELD_SIZE // 2,
+                               self._N * FIELD_SIZE + FONT_SIZE // 2)
+            surface.blit(text, textrect)
+
+    def frames(self, path, label=None):
+        """
+        Generates frames of the solution.
+
+        The same surface is yielded every time and only moved fields are
+        repainted between frames, so it has to be used (e.g. saved) before
+        the next frame is requested.
+
+        Arguments:
+            path (list): Serialized states of the solution.
+            label (str): Text under the puzzle, e.g. name of the solver.
+
+        Returns:
+            frames (generator): Surface with each frame.
+        """
+
+        puzzle = Puzzle(path, 0, 0, self._N)
+        height = self._N * FIELD_SIZE + (FONT_SIZE if label else 0)
+        surface = pygame.Surface((self._N * FIELD_SIZE, height))
+
+        self._draw_puzzle(surface, puzzle, label)
+        yield surface
+
+        while puzzle.next_move() is not None:
+            zero_index, exchange_index = puzzle.next_move()
+            zero_field = puzzle._fields[zero_index]
+            exchange_field = puzzle._fields[exchange_index]
+
+            # exchange field slides into the place of empty field
+            start_x, start_y = exchange_field._x, exchange_field._y
+            dx, dy = zero_field._x - start_x, zero_field._y - start_y
+            dirty_rect = pygame.Rect(start_x, start_y, FIELD_SIZE,
+                                     FIELD_SIZE).union(
+                (zero_field._x, zero_field._y, FIELD_SIZE, FIELD_SIZE))
+            img = self._sprites[exchange_field._value]
+
+            for frame in range(1, self._frames_per_move + 1):
+                surface.fill(BACKGROUND_COLOR, dirty_rect)
+                surface.blit(img, (
+                    start_x + dx * frame // self._frames_per_move,
+                    start_y + dy * frame // self._frames_per_move))
+                yield surface
+
+            puzzle.states_change()
+
+    def save_frames(self, path, directory, label=None):
+        """
+        Saves frames of the solution as numbered PNG images.
+
+        Arguments:
+            path (list): Serialized states of the solution.
+            directory (str): Output directory, created if it doesn't exist.
+            label (str): Text under the puzzle, e.g. name of the solver.
+
+        Returns:
+            n_frames (int): Number of saved frames.
+        """
+
+        os.makedirs(directory, exist_ok=True)
+
+        n_frames = 0
+        for surface in self.frames(path, label):
+            pygame.image.save(surface, os.path.join(
+                directory, "frame_%05d.png" % n_frames))
+            n_frames += 1
+
+        return n_frames
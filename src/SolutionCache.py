@@ -0,0 +1,204 @@
+import os
+import sqlite3
+
+from collections import OrderedDict
+
+from utils.utils import mirror_state, mirror_table
+
+# approximate memory taken by a single entry besides its moves (key, packed
+# state, dictionary slots) and by a single suffix index entry
+ENTRY_OVERHEAD = 200
+SUFFIX_OVERHEAD = 120
+
+
+class SolutionCache:
+    """
+    Cache of solutions keyed by solver configuration and starting state.
+
+    Solutions are stored as positions of blank tile after each move (one byte
+    per move) and evicted in least recently used order once their total size
+    exceeds `max_bytes`. For optimal solvers every suffix of an optimal path
+    is optimal as well, so each state along such path is indexed and can be
+    answered from the same entry.
+
+    State and its mirror (see `utils.utils.mirror_state`) have mirrored
+    solutions, so only one of them has to be cached.
+
+    Optionally, solutions are also saved to sqlite database which can be
+    shared between processes and sessions.
+    """
+
+    def __init__(self, max_bytes=64 * 1024 * 1024, path=None):
+        """
+        Base constructor.
+
+        Arguments:
+            max_bytes (int): Approximate memory limit of cached solutions.
+            path (str): Path of sqlite database, `None` keeps solutions only
+                in memory.
+        """
+
+        self._max_bytes = max_bytes
+        self._path = path
+
+        self._entries = OrderedDict()  # (config, state) -> moves
+        self._suffixes = {}  # (config, state) -> (config, start, offset)
+        self._size = 0
+        self._db = None
+
+    def __getstate__(self):
+        # each process opens its own database connection
+        state = self.__dict__.copy()
+        state["_db"] = None
+
+        return state
+
+    def _connect(self):
+        if self._db is None and self._path is not None:
+            directory = os.path.dirname(os.path.abspath(self._path))
+            os.makedirs(directory, exist_ok=True)
+
+            self._db = sqlite3.connect(self._path, timeout=30,
+                                       isolation_level=None)
+            self._db.execute("PRAGMA journal_mode=WAL")
+            self._db.execute("CREATE TABLE IF NOT EXISTS solutions ("
+                             "config TEXT, state BLOB, moves BLOB, "
+                             "PRIMARY KEY (config, state))")
+            self._db.execute("CREATE TABLE IF NOT EXISTS suffixes ("
+                             "config TEXT, state BLOB, start BLOB, "
+                             "offset INTEGER, PRIMARY KEY (config, state))")
+
+        return self._db
+
+    def _entry_size(self, moves, n_suffixes):
+        return ENTRY_OVERHEAD + len(moves) + n_suffixes * SUFFIX_OVERHEAD
+
+    def _insert(self, config, state, moves, states):
+        """Inserts entry into memory and evicts the oldest ones if needed."""
+        key = (config, state)
+        if key in self._entries:
+            self._entries.move_to_end(key)
+            return
+
+        self._entries[key] = (moves, states)
+        self._size += self._entry_size(moves, len(states))
+        for offset, suffix_state in enumerate(states):
+            self._suffixes[(config, suffix_state)] = (config, state, offset)
+
+        while self._size > self._max_bytes and len(self._entries) > 1:
+            (old_config, old_state), (old_moves, old_states) = \
+                self._entries.popitem(last=False)
+            self._size -= self._entry_size(old_moves, len(old_states))
+
+            for suffix_state in old_states:
+                suffix_key = (old_config, suffix_state)
+                if self._suffixes.get(suffix_key, (None, None))[1] == \
+                        old_state:
+                    del self._suffixes[suffix_key]
+
+    def _get_memory(self, config, state):
+        key = (config, state)
+        if key in self._entries:
+            self._entries.move_to_end(key)
+            return self._entries[key][0]
+
+        suffix = self._suffixes.get(key)
+        if suffix is not None:
+            _, start, offset = suffix
+            self._entries.move_to_end((config, start))
+            return self._entries[(config, start)][0][offset:]
+
+        return None
+
+    def _get_disk(self, config, state):
+        db = self._connect()
+        if db is None:
+            return None
+
+        state_key = _state_bytes(state)
+        row = db.execute("SELECT moves FROM solutions "
+                         "WHERE config = ? AND state = ?",
+                         (config, state_key)).fetchone()
+        if row is not None:
+            return bytes(row[0])
+
+        row = db.execute("SELECT solutions.moves, suffixes.offset "
+                         "FROM suffixes JOIN solutions "
+                         "ON suffixes.config = solutions.config AND "
+                         "suffixes.start = solutions.state "
+                         "WHERE suffixes.config = ? AND suffixes.state = ?",
+                         (config, state_key)).fetchone()
+        if row is not None:
+            return bytes(row[0])[row[1]:]
+
+        return None
+
+    def _get(self, config, state):
+        moves = self._get_memory(config, state)
+        if moves is None:
+            moves = self._get_disk(config, state)
+            if moves is not None:
+                self._insert(config, state, moves, [])
+
+        return moves
+
+    def get(self, config, state, N=None):
+        """
+        Returns cached solution of the given state.
+
+        Arguments:
+            config (str): Solver configuration (see `BaseSolver.config_key`).
+            state (int): Packed starting state.
+            N (int): Puzzle size, solution of the mirror state is looked up
+                as well if it's given.
+
+        Returns:
+            moves (bytes): Positions of blank tile after each move, `None`
+                if solution isn't cached.
+        """
+
+        moves = self._get(config, state)
+        if moves is None and N is not None:
+            moves = self._get(config, mirror_state(state, N))
+            if moves is not None:
+                mirror = mirror_table(N)
+                moves = bytes(mirror[blank] for blank in moves)
+
+        return moves
+
+    def put(self, config, state, moves, states=None):
+        """
+        Adds solution to the cache.
+
+        Arguments:
+            config (str): Solver configuration (see `BaseSolver.config_key`).
+            state (int): Packed starting state.
+            moves (bytes): Positions of blank tile after each move.
+            states (list): Packed states along the path whose suffixes can be
+                reused (all but the final one), `None` if suffixes aren't
+                valid solutions.
+        """
+
+        states = states or []
+        self._insert(config, state, moves, states)
+
+        db = self._connect()
+        if db is not None:
+            state_key = _state_bytes(state)
+            db.execute("BEGIN")
+            db.execute("INSERT OR IGNORE INTO solutions VALUES (?, ?, ?)",
+                       (config, state_key, moves))
+            db.executemany("INSERT OR IGNORE INTO suffixes "
+                           "VALUES (?, ?, ?, ?)",
+                           [(config, _state_bytes(suffix_state), state_key,
+                             offset)
+                            for offset, suffix_state in enumerate(states)])
+            db.execute("COMMIT")
+
+    def __len__(self):
+        return len(self._entries)
+
+
+def _state_bytes(state):
+    r"""Packed 4x4 states may not fit into sqlite integer, bytes are used."""
+    return state.to_bytes(8, "little")
@@ -0,0 +1,68 @@
+from functools import partial
+
+from .ARAstar import ARAstar
+from .Astar import Astar
+from .BiAstar import BiAstar
+from .IDAstar import IDAstar
+from .ParallelIDAstar import ParallelIDAstar
+from .WAstar import WAstar
+
+
+class Solvers:
+    """
+    Enum class for all available solvers.
+    """
+    ASTAR, IDASTAR, WASTAR_S, WASTAR_D, BIASTAR, IDASTAR_P, ARASTAR = \
+        1, 2, 3, 4, 5, 6, 7
+
+    # short names used in command line tools
+    TAGS = {
+        "astar": ASTAR,
+        "idastar": IDASTAR,
+        "wastar_static": WASTAR_S,
+        "wastar_dynamic": WASTAR_D,
+        "biastar": BIASTAR,
+        "idastar_parallel": IDASTAR_P,
+        "arastar": ARASTAR,
+    }
+
+    @staticmethod
+    def get_solver_idx(tag):
+        if tag not in Solvers.TAGS:
+            raise ValueError("Invalid solver tag")
+
+        return Solvers.TAGS[tag]
+
+    @staticmethod
+    def get_solver_name(idx):
+        if idx == Solvers.ASTAR:
+            return "A*"
+        elif idx == Solvers.IDASTAR:
+            return "IDA*"
+        elif idx == Solvers.WASTAR_D:
+            return "Dynamic WA*"
+        elif idx == Solvers.WASTAR_S:
+            return "Static WA*"
+        elif idx == Solvers.BIASTAR:
+            return "Bidirectional A*"
+        elif idx == Solvers.IDASTAR_P:
+            return "Parallel IDA*"
+        elif idx == Solvers.ARASTAR:
+            return "Anytime A*"
+
+    @staticmethod
+    def get_solver_instance(idx):
+        if idx == Solvers.ASTAR:
+            return Astar
+        elif idx == Solvers.IDASTAR:
+            return IDAstar
+        elif idx == Solvers.WASTAR_D:
+            return partial(WAstar, weight=4, mode="dynamic")
+        elif idx == Solvers.WASTAR_S:
+            return partial(WAstar, weight=4, mode="static")
+        elif idx == Solvers.BIASTAR:
+            return BiAstar
+        elif idx == Solvers.IDASTAR_P:
+            return ParallelIDAstar
+        elif idx == Solvers.ARASTAR:
+            return ARAstar
@@ -1,105 +1,174 @@
-import heapq
+import math
 
-from .BaseSolver import BaseSolver
-from utils.utils import reconstruct_path, serialize, is_solvable, h
+from .BaseSolver import BaseSolver, Status
+from .Budget import BudgetExceeded
+from .OpenList import get_open_list
+from utils.utils import pack, blank_index, is_solvable
 
 
 class WAstar(BaseSolver):
     """
     Weigthing A* algorithm.
 
-    It's possible to use either static or dynamic weighting. Both should
-    reduce time needed to solve the puzzle.
+    Heuristics is inflated by one of the weighting modes, which reduces time
+    needed to solve the puzzle. For weight `w` every mode guarantees that the
+    returned path is at most `w` times longer than the optimal one (states
+    are reopened whenever shorter path to them is found):
+
+        static: f = g + w * h
+        dynamic: f = g + (1 + (w - 1) * (1 - d / D)) * h, where `d` is depth
+            of the state and `D` the maximum solution length (Pohl)
+        xdp: f = (g + (2w - 1) * h + sqrt((g - h)^2 + 4w * g * h)) / 2w,
+            suboptimality is allowed near the goal (Chen and Sturtevant)
+        xup: f = (g + h + sqrt((g + h)^2 + 4w(w - 1) * h^2)) / 2w,
+            suboptimality is allowed near the start (Chen and Sturtevant)
     """
 
-    def __init__(self, N, weight, mode="none"):
+    MODES = ["static", "dynamic", "xdp", "xup"]
+    OPTIMAL = False
+
+    def __init__(self, N, weight, mode="static", heuristic="manhattan",
+                 open_list="bucket", randomize=False):
         """
         Base constructor.
 
-        If `mode` is anything but "static" or "dynamic" ValueError will be
-        raised. Static weighting will always multiply heuristics value with the
-        same number. Dynamic weighting will reduce impact of heuristics value
-        in deeper parts of search tree.
+        If `mode` isn't one of `MODES` or `weight` is less than 1 ValueError
+        will be raised. Bucket open list requires integer f scores, so binary
+        heap is used instead whenever weighting can produce non-integer ones
+        (every mode except static with integer weight).
 
         Arguments:
             N (int): Size of puzzle.
-            weight (number): Multiplier of heurstics.
-            mode (str): Either "dynamic" or "static".
+            weight (number): Suboptimality bound, at least 1.
+            mode (str): Weighting mode (see `MODES`).
+            heuristic (str or Heuristic): Heuristics (see `HEURISTICS`).
+            open_list (str): Open list (see `OPEN_LISTS`).
+            randomize (bool): If neighbors should be randomly shuffled.
         """
 
-        super().__init__(N)
+        super().__init__(N, heuristic=heuristic, randomize=randomize)
 
         mode = mode.lower()
-        if mode not in ["dynamic", "static"]:
+        if mode not in self.MODES:
             raise ValueError("Invalid mode")
+        if weight < 1:
+            raise ValueError("Invalid weight")
 
         self._weight = weight
         self._mode = mode
         self._max_depth = 80 if N == 4 else 31
+        self._priority = getattr(self, "_" + mode)
+
+        get_open_list(open_list)  # verifying that open list exists
+        if mode != "static" or not isinstance(weight, int):
+            open_list = "heap"  # f scores aren't integers
+        self._open_list = open_list
+
+    def _config(self):
+        config = super()._config()
+        config.update({"weight": self._weight, "mode": self._mode})
+
+        return config
+
+    def _static(self, g, h):
+        return g + self._weight * h
+
+    def _dynamic(self, g, h):
+        # weight drops to 1 at the maximum depth and stays there
+        depth_ratio = min(1, g / self._max_depth)
+
+        return g + (1 + (self._weight - 1) * (1 - depth_ratio)) * h
 
-    def solve(self, start_state):
+    def _xdp(self, g, h):
+        w = self._weight
+
+        return (g + (2 * w - 1) * h +
+                math.sqrt((g - h) ** 2 + 4 * w * g * h)) / (2 * w)
+
+    def _xup(self, g, h):
+        w = self._weight
+
+        return (g + h +
+                math.sqrt((g + h) ** 2 + 4 * w * (w - 1) * h ** 2)) / (2 * w)
+
+    def _solve(self, start_state):
         """
         Solving given puzzle.
 
-        This implementation assumes that given heurstics is consistent meaning
-        that it's sufficient to relax distance the moment it becomes possible
-        and such action will never be possible in the future. Manhattan
-        distance is used.
+        Weighted heuristics isn't consistent, so state is reopened whenever
+        shorter path to it is found, which keeps the suboptimality bound.
+        Manhattan distance is used by default.
 
         Arguments:
             start_state (list or np.ndarray): Starting state.
 
         Returns:
-            flag (bool): If puzzle is solvable.
+            flag (Status): If puzzle is solved, unsolvable or budget was
+                exceeded.
             n_iters (int): Number of iterations.
 
         """
 
-        self._start_state = serialize(start_state)
+        self._start_state = pack(start_state)
+        self._start_blank = blank_index(self._start_state, self._N)
         n_iters = 0
+        next_check = self._start_search()
 
         # trivial check if the given puzzle can be solved or not
-        if not is_solvable(self._start_state):
-            return False, (n_iters, None)
+        if not is_solvable(self._start_state, self._N):
+            return self._finish(Status.UNSOLVABLE, n_iters, None, 0)
+
+        # distance and generating move of each node, packed into one integer,
+        # depth of a node is its distance
+        nodes = {self._start_state: 0}
 
-        # initializing dictionaries for distances, parents and depth
-        dist, parent, depth = {}, {}, {}
-        dist[self._start_state] = 0
-        parent[self._start_state] = None
-        depth[self._start_state] = 0
+        move_index = self._move_index
+        update_h = self._heuristic.update
+        priority = self._priority
+        open_list = get_open_list(self._open_list)
+        start_h, start_aux = self._h(self._start_state)
+        open_list.push(priority(0, start_h), 0,
+                       (self._start_state, self._start_blank, 0, start_h,
+                        start_aux))
 
-        min_heap = []  # this list is used as Min-Heap
-        heapq.heappush(min_heap, (h(self._start_state), self._start_state))
+        while len(open_list) > 0:
+            state, blank, g_val, h_val, aux = open_list.pop()
 
-        while len(min_heap) > 0:
-            _, state = heapq.heappop(min_heap)
+            if g_val > nodes[state] >> 2:  # state was reached by shorter path
+                continue
 
             if state == self._end_state:
-                path = reconstruct_path(parent, state)
+                path = self._serialize_path(
+                    self._trace_path(nodes, state, blank))
 
-                return True, (n_iters, path)
+                return self._finish(Status.SOLVED, n_iters, path, len(nodes))
             else:
                 n_iters += 1
+                if n_iters == next_check:
+                    try:
+                        next_check = self._checkpoint(
+                            n_iters, g_val + h_val, len(open_list),
+                            len(nodes))
+                    except BudgetExceeded as e:
+                        return self._finish(Status.BUDGET_EXCEEDED, n_iters,
+                                            None, len(nodes), e.reason)
 
-                for next_state, w in self._get_neighbors(state):
-                    cur_dist = dist[state] + w
-
-                    if cur_dist < dist.get(next_state, float("inf")):  # relax
-                        dist[next_state] = cur_dist
-                        parent[next_state] = state
-                        depth[next_state] = depth[state] + 1
+                for next_state, next_blank, tile in self._get_neighbors(
+                        state, blank):
+                    cur_dist = g_val + 1
+                    code = nodes.get(next_state)
 
-                        g_val, h_val = cur_dist, h(next_state)
-                        # weighting heuristics
-                        if self._mode == "static":
-                            h_val *= (1 + self._weight) * h_val
-                        else:
-                            h_smoothing = depth[next_state] / self._max_depth
-                            h_val *= (1 + self._weight - h_smoothing)
+                    if code is None or cur_dist < code >> 2:  # relax
+                        nodes[next_state] = (cur_dist << 2) | \
+                            move_index[next_blank - blank]
 
-                        heapq.heappush(min_heap, (g_val + h_val, next_state))
+                        next_h, next_aux = update_h(h_val, aux, next_state,
+                                                    tile, next_blank, blank)
+                        open_list.push(priority(cur_dist, next_h), cur_dist,
+                                       (next_state, next_blank, cur_dist,
+                                        next_h, next_aux))
 
-        return False, (n_iters, None)
+        return self._finish(Status.UNSOLVABLE, n_iters, None, len(nodes))
 
 
 if __name__ == "__main__":
@@ -109,5 +178,5 @@ if __name__ == "__main__":
     ]
 
     for state in starting_states:
-        solver = WAstar(len(state), 4, mode="dynamic")
+        solver = WAstar(len(state), 2, mode="xdp")
         print(solver.solve(state))
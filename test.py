@@ -1,14 +1,25 @@
 import unittest
 import sys
 
+from src.ARAstar import ARAstar
 from src.Astar import Astar
+from src.BiAstar import BiAstar
 from src.WAstar import WAstar
 from src.IDAstar import IDAstar
+from src.ParallelIDAstar import ParallelIDAstar
+from src.LookupSolver import LookupSolver
 
 from tests.TestSolver3x3 import TestSolver3x3
 from tests.TestSolver4x4 import TestSolver4x4
 
-valid_tags = ["astar", "idastar", "wastar_static", "wastar_dynamic"]
+valid_tags = ["astar", "idastar", "wastar_static", "wastar_dynamic",
+              "astar_linear_conflict", "astar_walking_distance", "astar_pdb",
+              "idastar_pdb", "lookup", "biastar", "idastar_parallel",
+              "arastar", "idastar_pdb_mirror", "wastar_xdp", "wastar_xup",
+              "arastar_pdb_mirror"]
+
+# solvers that can't solve 4x4 puzzles
+tags_3x3_only = ["lookup"]
 
 
 if __name__ == "__main__":
@@ -21,16 +32,34 @@ if __name__ == "__main__":
         "astar": Astar,
         "idastar": IDAstar,
         "wastar_static": lambda N: WAstar(N, 4, mode="static"),
-        "wastar_dynamic": lambda N: WAstar(N, 4, mode="dynamic")
+        "wastar_dynamic": lambda N: WAstar(N, 4, mode="dynamic"),
+        "wastar_xdp": lambda N: WAstar(N, 4, mode="xdp"),
+        "wastar_xup": lambda N: WAstar(N, 4, mode="xup"),
+        "astar_linear_conflict":
+            lambda N: Astar(N, heuristic="linear_conflict"),
+        "astar_walking_distance":
+            lambda N: Astar(N, heuristic="walking_distance"),
+        "astar_pdb": lambda N: Astar(N, heuristic="pdb"),
+        "idastar_pdb": lambda N: IDAstar(N, heuristic="pdb"),
+        "idastar_pdb_mirror": lambda N: IDAstar(N, heuristic="pdb_mirror"),
+        "lookup": LookupSolver,
+        "biastar": BiAstar,
+        "idastar_parallel": ParallelIDAstar,
+        "arastar": ARAstar,
+        "arastar_pdb_mirror": lambda N: ARAstar(N, heuristic="pdb_mirror")
     }
 
     # making callback visible to unittest classes
-    sys.argv[1] = callbacks[sys.argv[1]]
+    tag = sys.argv[1]
+    sys.argv[1] = callbacks[tag]
 
     # unittest for 3x3 puzzle
     suite3x3 = unittest.TestLoader().loadTestsFromTestCase(TestSolver3x3)
     unittest.TextTestRunner(verbosity=2).run(suite3x3)
 
+    if tag in tags_3x3_only:
+        sys.exit()
+
     # unittest for 4x4 puzzle
     suite4x4 = unittest.TestLoader().loadTestsFromTestCase(TestSolver4x4)
     unittest.TextTestRunner(verbosity=2).run(suite4x4)
@@ -0,0 +1,61 @@
+import unittest
+
+from src.Astar import Astar
+from src.BaseSolver import Status
+from src.Budget import Budget
+from src.IDAstar import IDAstar
+from src.WAstar import WAstar
+
+# hard 4x4 state, none of the solvers solves it within the budgets below
+HARD_STATE = [[15, 14, 8, 12], [10, 11, 9, 13], [2, 6, 5, 1], [3, 7, 4, 0]]
+
+
+class TestBudget(unittest.TestCase):
+    """
+    Unit-testing class for solver budgets.
+
+    Each limit has to stop the search with `Status.BUDGET_EXCEEDED` (`None`,
+    which differs from `False` of unsolvable puzzles) and its own reason.
+    """
+
+    def _assert_exceeded(self, solver, budget, reason):
+        solver.set_budget(budget)
+        result, (_, path) = solver.solve(HARD_STATE)
+
+        self.assertIsNone(result)
+        self.assertIs(result, Status.BUDGET_EXCEEDED)
+        self.assertIsNone(path)
+        self.assertEqual(solver.get_stats()["reason"], reason)
+
+        return solver.get_stats()
+
+    def test_max_expansions(self):
+        for solver in (Astar(4), IDAstar(4), WAstar(4, 4)):
+            stats = self._assert_exceeded(
+                solver, Budget(max_expansions=5000), "expansions")
+            self.assertEqual(stats["n_iters"], 5000)
+
+    def test_time_limit(self):
+        for solver in (Astar(4), IDAstar(4), WAstar(4, 4)):
+            stats = self._assert_exceeded(
+                solver, Budget(time_limit=0.05, check_interval=64), "time")
+            self.assertLess(stats["time"], 1)
+
+    def test_max_closed(self):
+        # IDA* keeps only the current path in memory
+        for solver in (Astar(4), WAstar(4, 4)):
+            stats = self._assert_exceeded(
+                solver, Budget(max_closed=10000), "memory")
+            self.assertGreater(stats["closed"], 10000)
+
+    def test_unlimited(self):
+        solver = Astar(3)
+        solver.set_budget(Budget())
+        result, _ = solver.solve([[8, 6, 7], [2, 5, 4], [3, 0, 1]])
+
+        self.assertEqual(result, Status.SOLVED)
+        self.assertIsNone(solver.get_stats()["reason"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,98 @@
+import os
+import tempfile
+import unittest
+
+from src.Astar import Astar
+from src.SolutionCache import SolutionCache, ENTRY_OVERHEAD
+from utils.utils import pack, blank_index, mirror_state, mirror_table
+
+CONFIG = "optimal"
+
+
+def solution(start_state):
+    r"""
+    Solves the puzzle and returns the packed starting state, positions of
+    blank tile after each move and packed states along the path (all but the
+    final one), as they are stored in the cache.
+    """
+
+    N = len(start_state)
+    _, (_, path) = Astar(N).solve(start_state)
+
+    states = [pack(x) for x in path]
+    moves = bytes(blank_index(x, N) for x in states[1:])
+
+    return states[0], moves, states[:-1]
+
+
+class TestSolutionCache(unittest.TestCase):
+    """
+    Unit-testing class for the solution cache.
+    """
+
+    def setUp(self):
+        self._state, self._moves, self._states = solution(
+            [[8, 6, 7], [2, 5, 4], [3, 0, 1]])
+
+    def test_exact_hit(self):
+        cache = SolutionCache()
+        cache.put(CONFIG, self._state, self._moves, self._states)
+
+        self.assertEqual(cache.get(CONFIG, self._state), self._moves)
+        self.assertIsNone(cache.get("other", self._state))
+
+    def test_suffix_hit(self):
+        cache = SolutionCache()
+        cache.put(CONFIG, self._state, self._moves, self._states)
+
+        for offset, state in enumerate(self._states):
+            self.assertEqual(cache.get(CONFIG, state),
+                             self._moves[offset:])
+
+    def test_mirror_hit(self):
+        cache = SolutionCache()
+        cache.put(CONFIG, self._state, self._moves, self._states)
+
+        mirror = mirror_table(3)
+        mirrored = mirror_state(self._state, 3)
+
+        self.assertIsNone(cache.get(CONFIG, mirrored))
+        self.assertEqual(cache.get(CONFIG, mirrored, 3),
+                         bytes(mirror[blank] for blank in self._moves))
+
+    def test_eviction(self):
+        other_state, other_moves, other_states = solution(
+            [[6, 4, 7], [8, 5, 0], [3, 2, 1]])
+
+        # room for a single entry only
+        cache = SolutionCache(max_bytes=ENTRY_OVERHEAD + 100)
+        cache.put(CONFIG, self._state, self._moves, self._states)
+        cache.put(CONFIG, other_state, other_moves, other_states)
+
+        self.assertEqual(len(cache), 1)
+        self.assertIsNone(cache.get(CONFIG, self._state))
+        self.assertEqual(cache.get(CONFIG, other_state), other_moves)
+
+        # suffixes of the evicted entry are dropped as well
+        for state in set(self._states) - set(other_states):
+            self.assertNotIn((CONFIG, state), cache._suffixes)
+            self.assertIsNone(cache.get(CONFIG, state))
+
+    def test_shared_database(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "cache.db")
+
+            writer = SolutionCache(path=path)
+            writer.put(CONFIG, self._state, self._moves, self._states)
+
+            reader = SolutionCache(path=path)
+            self.assertEqual(reader.get(CONFIG, self._state), self._moves)
+            self.assertEqual(reader.get(CONFIG, self._states[3]),
+                             self._moves[3:])
+
+            writer._db.close()
+            reader._db.close()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,66 @@
+import unittest
+
+import numpy as np
+
+from utils.utils import is_solvable, random_state, pack, serialize
+
+
+def solvable_by_inversions(state):
+    r"""
+    Reference solvability check by counting inversions of tiles (blank is
+    skipped) for the final state with blank in the upper left corner.
+
+    Horizontal moves don't change the number of inversions and vertical ones
+    change it by `N - 1`. For odd `N` number of inversions has to be even,
+    for even `N` it's the sum of inversions and row of blank.
+    """
+
+    N = len(state)
+    tiles = [x for row in state for x in row]
+    values = [x for x in tiles if x != 0]
+
+    inversions = sum(1 for i in range(len(values))
+                     for j in range(i + 1, len(values))
+                     if values[i] > values[j])
+
+    if N % 2 == 1:
+        return inversions % 2 == 0
+
+    return (inversions + tiles.index(0) // N) % 2 == 0
+
+
+class TestSolvability(unittest.TestCase):
+    """
+    Unit-testing class for solvability check and random states.
+    """
+
+    def test_is_solvable(self):
+        rng = np.random.RandomState(0)
+
+        for N in (3, 4):
+            for _ in range(500):
+                tiles = rng.permutation(N * N)
+                state = tiles.reshape((N, N)).tolist()
+                expected = solvable_by_inversions(state)
+
+                self.assertEqual(is_solvable(state), expected)
+                self.assertEqual(is_solvable(np.array(state)), expected)
+                self.assertEqual(is_solvable(serialize(state)), expected)
+                self.assertEqual(is_solvable(pack(state), N), expected)
+
+    def test_random_state(self):
+        rng = np.random.RandomState(1)
+
+        for N in (3, 4):
+            for solvable in (True, False):
+                for _ in range(200):
+                    state = random_state(N, solvable, rng)
+
+                    self.assertEqual(sorted(sum(state, [])),
+                                     list(range(N * N)))
+                    self.assertEqual(solvable_by_inversions(state), solvable)
+                    self.assertEqual(is_solvable(state), solvable)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,13 +1,19 @@
 import sys
 import unittest
 
+import numpy as np
+
+from src.LookupSolver import LookupSolver
+from utils.utils import random_state
+
 
 class TestSolver3x3(unittest.TestCase):
     """
     Unit-testing class for 3x3 puzzles.
 
     Unit tests are separated based on difficulty. There are exactly 4 types i)
-    not solvable ii) easy iii) medium iv) hard.
+    not solvable ii) easy iii) medium iv) hard. Lengths of paths are also
+    compared with the optimal ones from the complete lookup table.
     """
 
     def setUp(self):
@@ -52,3 +58,23 @@ class TestSolver3x3(unittest.TestCase):
         result, _ = solver.solve(start_state)
 
         self.assertEqual(result, True)
+
+    def test_bound_3x3(self):
+        oracle = LookupSolver(3)
+        rng = np.random.RandomState(0)
+
+        # first state needs reopening of states with inconsistent heuristics
+        start_states = [[[6, 5, 7], [0, 3, 2], [4, 8, 1]]] + \
+            [random_state(3, rng=rng) for _ in range(20)]
+
+        for start_state in start_states:
+
+            solver = self._solver_callback(len(start_state))
+            result, (_, path) = solver.solve(start_state)
+
+            # solvers that claim optimality are held to the optimal length,
+            # weighted ones are within their weight of it
+            bound = 1 if solver.OPTIMAL else solver._weight
+            self.assertEqual(result, True)
+            self.assertLessEqual(len(path) - 1,
+                                 bound * oracle.distance(start_state))
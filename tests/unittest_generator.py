@@ -3,6 +3,8 @@ import time
 
 import numpy as np
 
+from utils.utils import random_state
+
 
 if __name__ == "__main__":
     parser = argparse.ArgumentParser()
@@ -10,6 +12,9 @@ if __name__ == "__main__":
                         help="Size of puzzle.")
     parser.add_argument("--n_tests", type=int, required=True,
                         help="Number of tests that will be generated.")
+    parser.add_argument("--solvability", type=str, default="any",
+                        choices=["any", "solvable", "unsolvable"],
+                        help="Solvability of generated states.")
     parser.add_argument("--seed", type=int, default=42, help="Radom seed.")
     args = parser.parse_args()
 
@@ -25,5 +30,9 @@ if __name__ == "__main__":
         state = np.arange(N * N)
 
         for test_id in range(n_tests):
-            np.random.shuffle(state)
-            print(state.reshape((N, N)).tolist(), file=f)
+            if args.solvability == "any":
+                np.random.shuffle(state)
+                print(state.reshape((N, N)).tolist(), file=f)
+            else:
+                solvable = args.solvability == "solvable"
+                print(random_state(N, solvable), file=f)
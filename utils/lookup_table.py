@@ -0,0 +1,189 @@
+import mmap
+import os
+import struct
+import sys
+import time
+
+from collections import deque
+
+from utils.utils import move_table, move_deltas
+from utils.pattern_database import TABLES_PATH
+
+# file starts with magic and puzzle size
+LUT_MAGIC = b"LUT1"
+LUT_HEADER = struct.Struct("<4sB")
+
+UNKNOWN = 255
+
+# each entry holds distance in lower 5 bits and next move in upper 2 bits
+DIST_MASK = 31
+MOVE_SHIFT = 5
+
+
+def state_rank(state, N):
+    r"""
+    Calculates perfect hash of solvable packed state.
+
+    For odd puzzle sizes state is solvable if and only if permutation of
+    tiles (without the blank) is even. Such permutation is determined by its
+    first `N * N - 3` tiles, since the last two are ordered by parity. Rank
+    is therefore position of blank tile combined with rank of the partial
+    permutation, which gives exactly `(N * N)! / 2` different values.
+
+    Arguments:
+        state (int): Packed state.
+        N (int): Puzzle size, has to be odd.
+    Returns:
+        rank (int): Index in lookup table.
+    """
+
+    N2 = N * N
+    n = N2 - 1  # number of tiles
+    blank, rank, unused = 0, 0, (1 << N2) - 2
+
+    i = 0
+    for pos in range(N2):
+        x = (state >> (pos << 2)) & 15
+        if x == 0:
+            blank = pos
+            continue
+        if i < n - 2:
+            # number of unused tiles smaller than the current one
+            smaller = bin(unused & ((1 << x) - 1)).count("1")
+            rank = rank * (n - i) + smaller
+            unused ^= 1 << x
+        i += 1
+
+    return rank * N2 + blank
+
+
+def build_lookup_table(N):
+    r"""
+    Builds lookup table of all solvable states with breadth-first search.
+
+    Search starts from the final state. Every entry holds optimal distance
+    to the final state and the move of blank tile that leads one step closer
+    (index in `move_deltas`).
+
+    Arguments:
+        N (int): Puzzle size, has to be odd.
+    Returns:
+        table (bytearray): Entries indexed by `state_rank`.
+    """
+
+    N2 = N * N
+    moves = move_table(N)
+    deltas = move_deltas(N)
+
+    size = 1
+    for i in range(3, N2 + 1):
+        size *= i
+    table = bytearray([UNKNOWN]) * size
+
+    start = 0
+    for x in range(N2):
+        start |= x << (x << 2)
+    table[state_rank(start, N)] = 0
+
+    queue = deque([(start, 0)])
+    while len(queue) > 0:
+        state, blank = queue.popleft()
+        cur_dist = table[state_rank(state, N)] & DIST_MASK
+
+        for target, shift in moves[blank]:
+            tile = (state >> shift) & 15
+            next_state = state + (tile << (blank << 2)) - (tile << shift)
+            next_rank = state_rank(next_state, N)
+
+            if table[next_rank] == UNKNOWN:
+                # from the next state blank tile has to go back
+                move = deltas.index(blank - target)
+                table[next_rank] = (cur_dist + 1) | (move << MOVE_SHIFT)
+                queue.append((next_state, target))
+
+    return table
+
+
+def lookup_table_path(N, path=TABLES_PATH):
+    r"""Returns path of file containing lookup table."""
+    return os.path.join(path, "lookup_%dx%d.bin" % (N, N))
+
+
+def save_lookup_table(table, N, path=TABLES_PATH):
+    r"""
+    Saves lookup table to disk.
+
+    File contains a short header (magic, puzzle size) followed by raw table,
+    one byte per entry.
+
+    Arguments:
+        table (bytearray): Lookup table.
+        N (int): Puzzle size.
+        path (str): Directory of lookup tables.
+    Returns:
+        f_name (str): Path of saved file.
+    """
+
+    os.makedirs(path, exist_ok=True)
+    f_name = lookup_table_path(N, path)
+
+    tmp_name = f_name + ".%d.tmp" % os.getpid()
+    with open(tmp_name, "wb") as f:
+        f.write(LUT_HEADER.pack(LUT_MAGIC, N))
+        f.write(table)
+    os.replace(tmp_name, f_name)
+
+    return f_name
+
+
+def load_lookup_table(N, path=TABLES_PATH):
+    r"""
+    Loads lookup table from disk as memory-mapped file.
+
+    ValueError will be raised if file isn't valid lookup table.
+
+    Arguments:
+        N (int): Puzzle size.
+        path (str): Directory of lookup tables.
+    Returns:
+        table (memoryview): Lookup table, `None` if file doesn't exist.
+    """
+
+    f_name = lookup_table_path(N, path)
+    if not os.path.exists(f_name):
+        return None
+
+    with open(f_name, "rb") as f:
+        data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+    magic, size = LUT_HEADER.unpack_from(data)
+    if magic != LUT_MAGIC or size != N:
+        raise ValueError("Invalid lookup table " + f_name)
+
+    return memoryview(data)[LUT_HEADER.size:]
+
+
+def get_lookup_table(N, path=TABLES_PATH):
+    r"""
+    Returns lookup table, building and saving it if it doesn't exist.
+
+    Arguments:
+        N (int): Puzzle size.
+        path (str): Directory of lookup tables.
+    Returns:
+        table (memoryview): Lookup table.
+    """
+
+    table = load_lookup_table(N, path)
+
+    if table is None:
+        start_time = time.time()
+        table = build_lookup_table(N)
+        f_name = save_lookup_table(table, N, path)
+        # stdout may carry results of the caller (e.g. batch.py)
+        print("Lookup table %s built in %.2fs" %
+              (f_name, time.time() - start_time), file=sys.stderr)
+
+        table = load_lookup_table(N, path)
+
+    return table
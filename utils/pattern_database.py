@@ -0,0 +1,228 @@
+import mmap
+import os
+import struct
+import sys
+import time
+
+from collections import deque
+
+from utils.utils import move_table, mirror_table
+
+TABLES_PATH = os.path.normpath(os.path.join(
+    os.path.dirname(os.path.abspath(__file__)), os.pardir, "tables"))
+
+# file starts with magic, puzzle size and number of pattern tiles
+PDB_MAGIC = b"PDB1"
+PDB_HEADER = struct.Struct("<4sBB")
+
+UNKNOWN = 255
+
+
+def pattern_index(positions, N):
+    r"""
+    Calculates index of pattern tiles' positions.
+
+    Positions are digits of a number in base `N * N`, which wastes some space
+    (positions can't repeat) but makes index trivial to update when a single
+    tile moves.
+
+    Arguments:
+        positions (list): Positions of pattern tiles.
+        N (int): Puzzle size.
+    Returns:
+        index (int): Index in pattern table.
+    """
+
+    index = 0
+    for pos in reversed(positions):
+        index = index * N * N + pos
+
+    return index
+
+
+def canonical_pattern(pattern, N):
+    r"""
+    Finds pattern whose table can be used for the given pattern.
+
+    Final state is symmetric under reflection over the main diagonal (see
+    `utils.utils.mirror_table`), so table of a pattern also gives distances
+    of its mirror pattern: tile in slot `k` is the mirror of the `k`-th tile
+    of the table pattern and its position is reflected as well. Of the two
+    mirror patterns, the one with smaller sorted tiles is canonical.
+
+    Arguments:
+        pattern (tuple): Pattern tiles.
+        N (int): Puzzle size.
+    Returns:
+        table_pattern (tuple): Pattern of the table that has to be used.
+        mirrored (bool): If positions have to be reflected.
+    """
+
+    mirror = mirror_table(N)
+    mirrored = tuple(sorted(mirror[x] for x in pattern))
+
+    if mirrored < tuple(sorted(pattern)):
+        return mirrored, True
+
+    return tuple(pattern), False
+
+
+def build_pattern_table(N, pattern):
+    r"""
+    Builds pattern table with retrograde breadth-first search.
+
+    Search starts from the final state and runs over positions of pattern
+    tiles and the blank tile. Only moves of pattern tiles are counted (moves
+    of other tiles are free) which makes tables of disjoint patterns
+    additive. This is 0-1 BFS, so the first time positions of pattern tiles
+    are reached their minimum distance over all blank positions is known.
+
+    Arguments:
+        N (int): Puzzle size.
+        pattern (tuple): Pattern tiles.
+    Returns:
+        table (bytearray): Distances indexed by `pattern_index`.
+    """
+
+    N2 = N * N
+    k = len(pattern)
+    moves = move_table(N)
+
+    table = bytearray([UNKNOWN]) * (N2 ** k)
+    dist = bytearray([UNKNOWN]) * (N2 ** (k + 1))
+
+    # in final state each tile is on position equal to its value
+    start = pattern_index(pattern, N) * N2
+    dist[start] = 0
+
+    queue = deque([start])
+    while len(queue) > 0:
+        code = queue.popleft()
+        cur_dist = dist[code]
+        index, blank = divmod(code, N2)
+
+        if table[index] == UNKNOWN:
+            table[index] = cur_dist
+
+        # slots of pattern tiles by their positions
+        occupied = {}
+        rest = index
+        for slot in range(k):
+            rest, pos = divmod(rest, N2)
+            occupied[pos] = slot
+
+        for target, _ in moves[blank]:
+            slot = occupied.get(target)
+
+            if slot is None:  # blank swaps with some other tile for free
+                next_code, next_dist = code - blank + target, cur_dist
+            else:  # pattern tile moves into the blank
+                next_index = index + (blank - target) * N2 ** slot
+                next_code, next_dist = next_index * N2 + target, cur_dist + 1
+
+            if next_dist < dist[next_code]:
+                dist[next_code] = next_dist
+                if next_dist == cur_dist:
+                    queue.appendleft(next_code)
+                else:
+                    queue.append(next_code)
+
+    return table
+
+
+def pattern_table_path(N, pattern, path=TABLES_PATH):
+    r"""Returns path of file containing pattern table."""
+    name = "pdb_%dx%d_%s.bin" % (N, N, "-".join(str(x) for x in pattern))
+
+    return os.path.join(path, name)
+
+
+def save_pattern_table(table, N, pattern, path=TABLES_PATH):
+    r"""
+    Saves pattern table to disk.
+
+    File contains a short header (magic, puzzle size, pattern tiles) followed
+    by raw table, one byte per entry.
+
+    Arguments:
+        table (bytearray): Pattern table.
+        N (int): Puzzle size.
+        pattern (tuple): Pattern tiles.
+        path (str): Directory of pattern tables.
+    Returns:
+        f_name (str): Path of saved file.
+    """
+
+    os.makedirs(path, exist_ok=True)
+    f_name = pattern_table_path(N, pattern, path)
+
+    # writing to temporary file first so other processes never see partially
+    # written table
+    tmp_name = f_name + ".%d.tmp" % os.getpid()
+    with open(tmp_name, "wb") as f:
+        f.write(PDB_HEADER.pack(PDB_MAGIC, N, len(pattern)))
+        f.write(bytes(pattern))
+        f.write(table)
+    os.replace(tmp_name, f_name)
+
+    return f_name
+
+
+def load_pattern_table(N, pattern, path=TABLES_PATH):
+    r"""
+    Loads pattern table from disk as memory-mapped file.
+
+    Memory-mapped tables are shared between processes, so each solver
+    process doesn't need its own copy. ValueError will be raised if file
+    doesn't match the given pattern.
+
+    Arguments:
+        N (int): Puzzle size.
+        pattern (tuple): Pattern tiles.
+        path (str): Directory of pattern tables.
+    Returns:
+        table (memoryview): Pattern table, `None` if file doesn't exist.
+    """
+
+    f_name = pattern_table_path(N, pattern, path)
+    if not os.path.exists(f_name):
+        return None
+
+    with open(f_name, "rb") as f:
+        data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+    offset = PDB_HEADER.size + len(pattern)
+    magic, size, k = PDB_HEADER.unpack_from(data)
+    tiles = tuple(data[PDB_HEADER.size:offset])
+    if magic != PDB_MAGIC or size != N or tiles != tuple(pattern) or \
+            len(data) != offset + (N * N) ** k:
+        raise ValueError("Invalid pattern table " + f_name)
+
+    return memoryview(data)[offset:]
+
+
+def get_pattern_table(N, pattern, path=TABLES_PATH):
+    r"""
+    Returns pattern table, building and saving it if it doesn't exist.
+
+    Arguments:
+        N (int): Puzzle size.
+        pattern (tuple): Pattern tiles.
+        path (str): Directory of pattern tables.
+    Returns:
+        table (memoryview): Pattern table.
+    """
+
+    table = load_pattern_table(N, pattern, path)
+
+    if table is None:
+        start_time = time.time()
+        table = build_pattern_table(N, pattern)
+        f_name = save_pattern_table(table, N, pattern, path)
+        # stdout may carry results of the caller (e.g. batch.py)
+        print("Pattern table %s built in %.2fs" %
+              (f_name, time.time() - start_time), file=sys.stderr)
+
+        table = load_pattern_table(N, pattern, path)
+
+    return table
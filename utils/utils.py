@@ -2,7 +2,8 @@ import time
 
 import numpy as np
 
-from permutation import Permutation
+# precomputed move tables for each puzzle size
+_MOVE_TABLES = {}
 
 
 def generate_state(N):
@@ -17,24 +18,30 @@ def generate_state(N):
     return state, is_solvable(state)
 
 
-def reconstruct_path(parent, state):
+def random_state(N, solvable=True, rng=np.random):
     r"""
-    Reconstructs the shortest path in the search tree.
+    Generates random state that is guaranteed to be solvable or unsolvable.
 
-    It's assumed that starting node have `None` as a parent.
+    Swapping two tiles (not the blank) flips parity of the permutation, so
+    it maps solvable states to unsolvable ones and vice versa. Shuffled state
+    of the wrong kind is fixed by swapping its first two tiles, so both kinds
+    are still uniformly distributed.
 
     Arguments:
-        parent (dict): Dictionary of parents for each node.
-        state (str): Hash of the terminating state.
+        N (int): Puzzle size.
+        solvable (bool): If generated state has to be solvable.
+        rng (np.random.RandomState): Random generator.
+    Returns:
+        state (list): Generated state.
     """
 
-    path = [state]
+    tiles = rng.permutation(N * N).tolist()
 
-    while parent[state] is not None:
-        state = parent[state]
-        path.append(state)
+    if _solvable_tiles(tiles, N) != solvable:
+        i, j = [k for k in range(3) if tiles[k] != 0][:2]
+        tiles[i], tiles[j] = tiles[j], tiles[i]
 
-    return path[::-1]
+    return [tiles[i:i + N] for i in range(0, N * N, N)]
 
 
 def deserialize(hash_val):
@@ -58,7 +65,10 @@ def h(state):
     r"""
     Calculates Manhattan distance between given state and final state.
 
-    Used as a heuristics for A* variants.
+    Used as a heuristics for A* variants. Blank tile isn't counted, otherwise
+    heuristics wouldn't be admissible. Solvers update this value
+    incrementally (see `manhattan_table`) so this function is mostly used for
+    validation.
 
     Arguments:
         state (str, np.ndarray or list): Given state.
@@ -74,17 +84,40 @@ def h(state):
     if isinstance(state, np.ndarray):
         N = state.shape[0]
     elif isinstance(state, list):
-        N = len(N)
+        N = len(state)
 
     # summing distances for all tiles
     cost = 0
     for i, row in enumerate(state):
         for j, x in enumerate(row):
-            cost += abs(x % N - j) + abs(x // N - i)
+            if x != 0:
+                cost += abs(x % N - j) + abs(x // N - i)
 
     return cost
 
 
+def manhattan_table(N):
+    r"""
+    Precomputes Manhattan distances for each tile and each position.
+
+    Distance of blank tile is always zero. When tile `x` is moved from
+    position `src` to position `dst`, Manhattan distance of the state changes
+    by `table[x][dst] - table[x][src]`.
+
+    Arguments:
+        N (int): Puzzle size.
+    Returns:
+        table (list): Distances indexed by tile and position.
+    """
+
+    table = [[0] * (N * N)]
+    for x in range(1, N * N):
+        table.append([abs(x % N - i % N) + abs(x // N - i // N)
+                      for i in range(N * N)])
+
+    return table
+
+
 def serialize(state):
     r"""
     Serializing given state.
@@ -108,30 +141,187 @@ def serialize(state):
     return ':'.join(hash_val)
 
 
-def is_solvable(state):
+def _flatten(state):
+    # flattening either serialized string, 2D list or 2D np.ndarray
+    if isinstance(state, str):
+        return [int(x) for x in state.split(':')]
+    elif isinstance(state, list):
+        return sum(state, [])
+    elif isinstance(state, np.ndarray):
+        return state.flatten().tolist()
+
+
+def pack(state):
     r"""
-    Determines if its given puzzle solvable.
+    Packing given state into a single integer.
 
-    It's done by calculating sign of sum of the state's permutation and
-    Manhattan distance of empty cell. If aforementioned sum is odd there is no
-    solution.
+    Each tile takes 4 bits and the tile at position `i` (in row-major order)
+    occupies bits `4i` to `4i + 3`, which is enough for both 3x3 and 4x4
+    puzzles (at most 64 bits). Packed states are used as compact keys inside
+    the solvers.
 
     Arguments:
         state (str, list or np.ndarray): Given state.
     Returns:
-        flag (bool): If it's possible to solve the puzzle.
+        packed (int): Packed state.
     """
 
-    # np.ndarray is necessary for futher calculations
-    if isinstance(state, str):
-        state = deserialize(state)
-    elif isinstance(state, list):
-        state = np.array(state)
+    packed = 0
+    for i, x in enumerate(_flatten(state)):
+        packed |= x << (i << 2)
+
+    return packed
 
-    p = (state + 1).flatten()  # elements have to be positive
-    p = Permutation(*p)
-    sign = 0 if p.is_even else 1
 
-    r, c = np.squeeze(np.argwhere(state == 0))
+def unpack(packed, N):
+    r"""
+    Unpacking given integer into 2D list.
+
+    Arguments:
+        packed (int): Packed state.
+        N (int): Puzzle size.
+    Returns:
+        state (list): Unpacked state.
+    """
+
+    tiles = [(packed >> (i << 2)) & 15 for i in range(N * N)]
+
+    return [tiles[i:i + N] for i in range(0, N * N, N)]
+
+
+def blank_index(packed, N):
+    r"""
+    Finds position of blank tile in packed state.
+
+    Arguments:
+        packed (int): Packed state.
+        N (int): Puzzle size.
+    Returns:
+        index (int): Position of blank tile in row-major order.
+    """
+
+    for i in range(N * N):
+        if (packed >> (i << 2)) & 15 == 0:
+            return i
+
+
+def mirror_table(N):
+    r"""
+    Returns reflection of positions over the main diagonal.
+
+    Final state is symmetric under this reflection, so the same table also
+    relabels tiles: tile `x` of a state is tile `table[x]` of its mirror.
+    State and its mirror have the same optimal distance.
+
+    Arguments:
+        N (int): Puzzle size.
+    Returns:
+        table (list): Reflected position for each position.
+    """
+
+    return [(x % N) * N + x // N for x in range(N * N)]
+
+
+def mirror_state(packed, N):
+    r"""
+    Reflects packed state over the main diagonal and relabels its tiles.
+
+    Arguments:
+        packed (int): Packed state.
+        N (int): Puzzle size.
+    Returns:
+        mirrored (int): Packed mirror state.
+    """
+
+    table = mirror_table(N)
+
+    mirrored = 0
+    for i in range(N * N):
+        mirrored |= table[(packed >> (i << 2)) & 15] << (table[i] << 2)
+
+    return mirrored
+
+
+def move_deltas(N):
+    r"""Returns blank position changes for moves up, down, left and right."""
+    return (-N, N, -1, 1)
+
+
+def move_table(N):
+    r"""
+    Returns precomputed move table for the given puzzle size.
+
+    For each position of the blank tile table contains tuple of pairs
+    `(target, shift)` where `target` is position of the tile that can be moved
+    into the blank and `shift` is its bit offset in packed state. Tables are
+    computed only once per puzzle size.
+
+    Arguments:
+        N (int): Puzzle size.
+    Returns:
+        table (list): Legal moves for each position of blank tile.
+    """
+
+    if N not in _MOVE_TABLES:
+        table = []
+        for blank in range(N * N):
+            r, c = divmod(blank, N)
+
+            targets = []
+            if r > 0:
+                targets.append(blank - N)
+            if r < N - 1:
+                targets.append(blank + N)
+            if c > 0:
+                targets.append(blank - 1)
+            if c < N - 1:
+                targets.append(blank + 1)
+
+            table.append(tuple((t, t << 2) for t in targets))
+
+        _MOVE_TABLES[N] = table
+
+    return _MOVE_TABLES[N]
+
+
+def _solvable_tiles(tiles, N):
+    # every cycle of length `k` is a product of `k - 1` transpositions
+    parity, seen = 0, [False] * len(tiles)
+    for i in range(len(tiles)):
+        if seen[i]:
+            continue
+
+        seen[i] = True
+        j = tiles[i]
+        while j != i:
+            seen[j] = True
+            j = tiles[j]
+            parity += 1
+
+    r, c = divmod(tiles.index(0), N)
+
+    return (parity + r + c) % 2 == 0
+
+
+def is_solvable(state, N=None):
+    r"""
+    Determines if its given puzzle solvable.
+
+    It's done by calculating parity of the state's permutation and Manhattan
+    distance of empty cell. If their sum is odd there is no solution. Parity
+    is found by cycle decomposition in O(N * N) time.
+
+    Arguments:
+        state (int, str, list or np.ndarray): Given state.
+        N (int): Puzzle size, required only for packed state.
+    Returns:
+        flag (bool): If it's possible to solve the puzzle.
+    """
+
+    if isinstance(state, int):
+        tiles = [(state >> (i << 2)) & 15 for i in range(N * N)]
+    else:
+        tiles = _flatten(state)
+        N = int(round(len(tiles) ** 0.5))
 
-    return (sign + r + c) % 2 == 0
+    return _solvable_tiles(tiles, N)